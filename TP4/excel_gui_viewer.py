@@ -1,9 +1,22 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import json
+from tkinter import ttk
+import re
 import random
 import math
+import heapq
+import bisect
+import hashlib
+import copy
+import queue
+import threading
+import functools
 from collections import deque
+from types import SimpleNamespace
+
+try:
+    import orjson  # opcional: vuelca la config más rápido que json
+except ImportError:
+    orjson = None
 
 APP_TITLE = "Parámetros de Simulación - Biblioteca UTN - Grupo 8"
 ROW_EVEN_BG = "#ffffff"      # fila par
@@ -18,13 +31,52 @@ GROUP_BG = "#e8efff"
 GROUP_BORDER = "#a8b3d7"
 MAX_CAPACITY = 20  # Máximo total de personas dentro (2 bibliotecarios + hasta 18 clientes)
 
+# Estados y acciones como enteros: el motor compara ints y los textos
+# se buscan en estas tuplas recién al armar lo que se muestra.
+LIBRE, OCUPADO = 0, 1
+ESTADO_BIB_STR = ("LIBRE", "OCUPADO")
+
+EN_COLA, ATENDIDO_1, ATENDIDO_2, LEYENDO, DESTRUCCION = range(5)
+ESTADO_CLI_STR = ("EN COLA", "SA(1)", "SA(2)", "LB", "DESTRUCCION")
+
+PEDIR, DEVOLVER, CONSULTAR = range(3)
+ACCION_STR = ("Pedir", "Devolver", "Consultar")
+
 
 # ----------------- Utilidades simples -----------------
 def int_or_none(s: str):
-    try:
-        return int(s)
-    except Exception:
-        return None
+    # Los campos solo admiten dígitos (ver _only_digits): no hace falta try/except.
+    # isdecimal() y no isdigit(): "²" es dígito pero int() no lo acepta.
+    return int(s) if s and s.isdecimal() else None
+
+
+# Validación de teclado de los campos enteros: vacío o solo dígitos
+_DIGITS_RE = re.compile(r"\A\d*\Z").match
+
+
+def _only_digits(P):
+    return _DIGITS_RE(P) is not None
+
+
+# Rango válido de cada campo entero del formulario: (key, descripción, lo, hi)
+FIELD_SPECS = (
+    ("tiempo_limite", "Tiempo límite X", 1, 10_000_000),
+    ("i_mostrar", "i (iteraciones a mostrar)", 1, 100_000),
+    ("j_inicio", "j (minuto de inicio)", 0, 10_000_000),
+    ("t_entre_llegadas", "Tiempo entre llegadas (min)", 1, 10_000),
+    ("pct_pedir", "Pedir libros (%)", 0, 100),
+    ("pct_devolver", "Devolver libros (%)", 0, 100),
+    ("pct_consultar", "Consultar hacerse socio (%)", 0, 100),
+    ("uni_a", "Uniforme A (min)", 0, 10_000),
+    ("uni_b", "Uniforme B (min)", 0, 10_000),
+    ("pct_retira", "Se retira a leer en casa (%)", 0, 100),
+    ("t_lectura_biblio", "Tiempo fijo en biblioteca (min)", 1, 10_000),
+)
+
+
+def _digits_to_int(s, _z=0):
+    # Para campos ya validados con _only_digits: int() no puede fallar
+    return int(s) if s else _z
 
 
 def between(value, lo=None, hi=None):
@@ -37,40 +89,162 @@ def between(value, lo=None, hi=None):
     return True
 
 
+def leer_parametros(cfg):
+    """
+    Aplana la config (dict anidado que arma el formulario) en un
+    SimpleNamespace, una sola vez. El resto del código lee atributos
+    en vez de encadenar cfg[...][...].
+    """
+    sim = cfg["simulacion"]
+    vec = sim["mostrar_vector_estado"]
+    mot = cfg["motivos"]
+    lec = cfg["lectura"]
+    return SimpleNamespace(
+        t_inter=cfg["llegadas"]["tiempo_entre_llegadas_min"],
+        p_pedir=mot["pedir_libros_pct"] / 100.0,
+        p_devolver=mot["devolver_libros_pct"] / 100.0,
+        p_consultar=mot["consultar_socios_pct"] / 100.0,
+        uni_a=cfg["consultas_uniforme"]["a_min"],
+        uni_b=cfg["consultas_uniforme"]["b_min"],
+        p_retira=lec["retira_casa_pct"] / 100.0,
+        t_lect_biblio=lec["tiempo_fijo_biblioteca_min"],
+        time_limit=sim["tiempo_limite_min"],
+        i_iteraciones=int(vec["i_iteraciones"]),
+        desde_j=vec["desde_minuto_j"],
+        modo_auto=bool(sim.get("modo_auto", False)),
+        layout_clientes_fijo=bool(sim.get("layout_clientes_fijo", True)),
+        max_clientes_fijos=int(sim.get("max_clientes_fijos", 20)),
+    )
+
+
+def _armar_cfg(key):
+    """
+    Arma el dict de configuración a partir de la tupla de valores ya
+    validados del formulario (ver App.on_generate).
+    """
+    t_lim, i_mos, j_ini, auto, t_lleg, p_ped, p_dev, p_con, a, b, p_ret, t_bib = key
+    return {
+        "simulacion": {
+            "tiempo_limite_min": t_lim,
+            "mostrar_vector_estado": {
+                "i_iteraciones": i_mos,
+                "desde_minuto_j": j_ini
+            },
+            "modo_auto": auto
+        },
+        "llegadas": {
+            "tiempo_entre_llegadas_min": t_lleg
+        },
+        "motivos": {
+            "pedir_libros_pct": p_ped,
+            "devolver_libros_pct": p_dev,
+            "consultar_socios_pct": p_con
+        },
+        "consultas_uniforme": {
+            "a_min": a,
+            "b_min": b
+        },
+        "lectura": {
+            "retira_casa_pct": p_ret,
+            "queda_biblioteca_pct": 100 - p_ret,
+            "tiempo_fijo_biblioteca_min": t_bib
+        }
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _dump_cfg(key):
+    """
+    JSON lindo de la config; generar dos veces con los mismos valores
+    no vuelve a serializar.
+    """
+    cfg = _armar_cfg(key)
+    if orjson is not None:
+        return orjson.dumps(cfg, option=orjson.OPT_INDENT_2).decode()
+    import json  # diferido: recién se necesita al generar
+    return json.dumps(cfg, indent=2, ensure_ascii=False)
+
+
 def fmt(x, nd=2):
     if x is None or x == "":
         return ""
     return f"{x:.{nd}f}"
 
 
+# Columnas de la fila que el motor entrega como número crudo (float) y
+# se formatean recién al mostrarse: id de columna -> decimales
+FORMATO_COLUMNAS = {
+    "reloj": 2,
+    "lleg_tiempo": 2,
+    "lleg_minuto": 2,
+    "trx_rnd": 4,
+    "lee_rnd": 4,
+    "lee_tiempo": 2,
+    "lee_fin": 2,
+    "b1_rnd": 2,
+    "b1_demora": 2,
+    "b1_hora": 2,
+    "b2_rnd": 2,
+    "b2_demora": 2,
+    "b2_hora": 2,
+    "est_b1_libre": 2,
+    "est_b2_libre": 2,
+    "est_bib_ocioso_acum": 2,
+    "est_cli_perm_acum": 2,
+}
+
+# Columnas base de la fila que arma el motor. La fila es una lista
+# posicional en este mismo orden (el de la tabla), no un dict.
+COL_NAMES = (
+    "iteracion", "evento", "reloj",
+    "lleg_tiempo", "lleg_minuto",
+    "trx_rnd", "trx_tipo",
+    "lee_rnd", "lee_lugar", "lee_tiempo", "lee_fin",
+    "b1_estado", "b1_rnd", "b1_demora", "b1_hora",
+    "b2_estado", "b2_rnd", "b2_demora", "b2_hora",
+    "cola",
+    "biblio_estado", "biblio_personas",
+    "est_b1_libre", "est_b2_libre", "est_bib_ocioso_acum",
+    "est_cli_perm_acum",
+)
+# Decimales por posición de la fila (None = se muestra tal cual)
+FORMATO_POR_COL = tuple(FORMATO_COLUMNAS.get(c) for c in COL_NAMES)
+
+
 # ----------------- Modelos -----------------
 class Cliente:
+    # Atributos fijos: cada cliente ocupa menos memoria y el acceso es más directo
+    __slots__ = ("id", "estado", "hora_llegada", "hora_entrada_cola",
+                 "a_que_fue_inicial", "accion_actual", "fin_lect_num", "cuando_termina_leer")
+
     def __init__(self, cid, hora_llegada):
         self.id = cid
-        # estado puede ser:
-        # "EN COLA", "SIENDO ATENDIDO(1)", "SIENDO ATENDIDO(2)", "EC LEYENDO", "DESTRUCCION"
-        self.estado = "EN COLA"
+        # estado puede ser (ver ESTADO_CLI_STR):
+        # EN_COLA, ATENDIDO_1, ATENDIDO_2, LEYENDO, DESTRUCCION
+        self.estado = EN_COLA
 
         # Tiempos clave
         self.hora_llegada = hora_llegada  # float, necesitamos esto para permanencia total
         self.hora_entrada_cola = hora_llegada  # cuando entra o reingresa a cola
 
         # Motivo / acción
-        self.a_que_fue_inicial = ""   # Pedir / Devolver / Consultar (primera vez que se define)
-        self.accion_actual = ""       # acción actual que se está atendiendo
+        self.a_que_fue_inicial = None  # PEDIR / DEVOLVER / CONSULTAR (primera vez que se define)
+        self.accion_actual = None      # acción actual que se está atendiendo
 
         # Lectura en biblioteca
         self.fin_lect_num = None      # float con el fin de lectura (si está leyendo en biblioteca)
-        self.cuando_termina_leer = "" # string para mostrar "hh.hh" o mensaje
+        self.cuando_termina_leer = "" # mensaje a mostrar (el fin de lectura sale de fin_lect_num)
 
 
 class Bibliotecario:
+    __slots__ = ("estado", "rnd", "demora", "hora_num", "cliente_id")
+
     def __init__(self):
-        self.estado = "LIBRE"     # "LIBRE" / "OCUPADO"
+        self.estado = LIBRE       # LIBRE / OCUPADO
+        # Números crudos: se formatean recién al armar la fila (FORMATO_COLUMNAS)
         self.rnd = ""             # RND del servicio asignado en ESTE evento
         self.demora = ""          # Demora asignada en ESTE evento
-        self.hora = ""            # Fin de servicio estimado (string)
-        self.hora_num = None      # Fin de servicio estimado (float)
+        self.hora_num = None      # Fin de servicio estimado
         self.cliente_id = None    # ID del cliente que atiende ahora
 
 
@@ -93,32 +267,57 @@ class SimulationEngine:
 
     def __init__(self, cfg):
         self.cfg = cfg
+        P = self.P = leer_parametros(cfg)
 
-        # Parámetros generales
-        self.t_inter = cfg["llegadas"]["tiempo_entre_llegadas_min"]
+        # Parámetros generales (copiados al motor: en los eventos es una
+        # sola búsqueda de atributo)
+        self.t_inter = P.t_inter
 
-        self.p_pedir = cfg["motivos"]["pedir_libros_pct"] / 100.0
-        self.p_devolver = cfg["motivos"]["devolver_libros_pct"] / 100.0
-        self.p_consultar = cfg["motivos"]["consultar_socios_pct"] / 100.0
+        self.p_pedir = P.p_pedir
+        self.p_devolver = P.p_devolver
+        self.p_consultar = P.p_consultar
+        # Probabilidades acumuladas de los motivos, en el orden de los
+        # códigos PEDIR, DEVOLVER (CONSULTAR es lo que queda hasta 1)
+        self._cum_motivos = (P.p_pedir, P.p_pedir + P.p_devolver)
 
-        self.uni_a = cfg["consultas_uniforme"]["a_min"]
-        self.uni_b = cfg["consultas_uniforme"]["b_min"]
+        self.uni_a = P.uni_a
+        self.uni_b = P.uni_b
 
-        self.p_retira = cfg["lectura"]["retira_casa_pct"] / 100.0
-        self.t_lect_biblio = cfg["lectura"]["tiempo_fijo_biblioteca_min"]
+        self.p_retira = P.p_retira
+        self.t_lect_biblio = P.t_lect_biblio
 
-        self.time_limit = cfg["simulacion"]["tiempo_limite_min"]
-        
-        
+        self.time_limit = P.time_limit
 
         # Estado temporal
-        self.clock = cfg["simulacion"]["mostrar_vector_estado"]["desde_minuto_j"]
+        self.clock = P.desde_j
         self.last_clock = self.clock
         self.next_arrival = self.clock + self.t_inter
 
         self.iteration = 0
         self.next_client_id = 1
 
+        # Agenda de eventos futuros (heap). Cada entrada es
+        # (t, prioridad, id, generacion, tipo); _gen guarda la generación vigente
+        # de cada (tipo, id) para descartar entradas viejas de forma perezosa.
+        self._events = []
+        self._gen = {}
+        self._gen_seq = 0  # generaciones únicas, nunca se reutilizan
+        self._schedule("llegada", 0, self.next_arrival)
+
+        # Generador propio con semilla derivada de la config:
+        # la misma config reproduce exactamente la misma corrida.
+        self.seed = self.semilla_desde_config(cfg)
+        self._rng = random.Random(self.seed)
+
+        # Números aleatorios pre-generados por bloques (ver _rand)
+        self._rbuf = []
+        self._ri = 0
+
+        # Demoras de servicio pre-calculadas por tipo (índice = PEDIR/DEVOLVER/CONSULTAR)
+        # y la próxima posición a usar de cada pool
+        self._pools_demora = [[], [], []]
+        self._pools_idx = [0, 0, 0]
+
         # Estructuras de estado del sistema
         self.cola = deque()            # cola FIFO de IDs de cliente
         self.clientes = {}             # id -> Cliente (solo vivos / activos / recién destruidos)
@@ -132,11 +331,8 @@ class SimulationEngine:
         self.biblio_estado = ""
         self._update_biblio_estado()
 
-        # Valores que se muestran SOLO en la fila actual (por bibliotecario)
-        self.last_b = {
-            1: {"rnd": "", "demora": "", "trx_rnd": "", "trx_tipo": ""},
-            2: {"rnd": "", "demora": "", "trx_rnd": "", "trx_tipo": ""},
-        }
+        # RND / Demora que se muestran SOLO en la fila actual (por bibliotecario)
+        self._reset_last()
 
         # Métricas acumuladas GLOBALES históricas
         # - est_b1_libre_acum / est_b2_libre_acum:
@@ -151,6 +347,10 @@ class SimulationEngine:
         self.last_iter_b1_libre = 0.0
         self.last_iter_b2_libre = 0.0
 
+        # Tramos (t, b1_libre, b2_libre) de eventos procesados sin fila,
+        # pendientes de integrar en bloque (ver _integrar_tramos)
+        self._tramos = []
+
         # Acumulador histórico de permanencia de clientes destruidos
         # (ACUMULADOR TIEMPO PERMANENCIA en la tabla)
         self.cli_perm_acum_total = 0.0
@@ -163,6 +363,70 @@ class SimulationEngine:
         self._finalizado = False
 
     # ----------------- helpers internos -----------------
+    # Prioridad para desempatar eventos simultáneos (ver _proximo_evento)
+    _PRIORIDAD_EVENTO = {"fin_atencion": 0, "fin_lectura": 3, "llegada": 4}
+
+    def _schedule(self, tipo, ident, t):
+        """
+        Agenda (o reprograma) el evento (tipo, ident) para el tiempo t.
+        Si ya había uno agendado para el mismo (tipo, ident), queda invalidado.
+        """
+        self._gen_seq += 1
+        gen = self._gen_seq
+        self._gen[(tipo, ident)] = gen
+        # FIN_ATENCION_i desempata por i (1 ó 2); el resto por su prioridad fija + id
+        prio = self._PRIORIDAD_EVENTO[tipo] + (ident if tipo == "fin_atencion" else 0)
+        heapq.heappush(self._events, (t, prio, ident, gen, tipo))
+
+    # Cantidad de números aleatorios que se generan de una vez
+    RND_BLOQUE = 4096
+    # Cantidad de demoras que se pre-calculan de una vez por tipo de transacción
+    DEMORAS_BLOQUE = 8192
+
+    @staticmethod
+    def semilla_desde_config(cfg):
+        """
+        Semilla de 64 bits derivada del hash de la config (en JSON ordenado).
+        """
+        import json
+        data = json.dumps(cfg, sort_keys=True).encode()
+        return int.from_bytes(hashlib.md5(data).digest()[:8], "big")
+
+    def checkpoint(self):
+        """
+        Copia completa del estado del motor (incluye el estado del RNG),
+        para poder retomar la simulación desde este punto con resume().
+        Es cara (deepcopy de todo el motor): se llama a pedido, no por evento.
+        """
+        return copy.deepcopy(self.__dict__)
+
+    @classmethod
+    def resume(cls, state):
+        """
+        Crea un motor a partir de un estado guardado con checkpoint(),
+        sin volver a simular los eventos anteriores.
+        """
+        eng = cls.__new__(cls)
+        eng.__dict__.update(copy.deepcopy(state))
+        return eng
+
+    def _rand(self):
+        """
+        Devuelve el siguiente RND en [0,1) del bloque pre-generado.
+        Cuando el bloque se agota se genera otro entero de una sola vez.
+        Los pools de demoras (_rellenar_demoras) sacan sus bloques del mismo
+        self._rng, así que los valores quedan intercalados por bloques: la
+        corrida es reproducible para una misma semilla, pero no es la misma
+        secuencia que daría pedir un random() por cada uso.
+        """
+        i = self._ri
+        if i >= len(self._rbuf):
+            rnd = self._rng.random
+            self._rbuf = [rnd() for _ in range(self.RND_BLOQUE)]
+            i = 0
+        self._ri = i + 1
+        return self._rbuf[i]
+
     def _clear_destroyed_clients(self):
         """
         Borra definitivamente (de self.clientes) los que ya salieron en el evento anterior.
@@ -179,41 +443,38 @@ class SimulationEngine:
         return len(self.cola) > 0
 
     def _primer_bib_libre(self):
-        if self.bib[0].estado == "LIBRE":
+        if self.bib[0].estado == LIBRE:
             return 0
-        if self.bib[1].estado == "LIBRE":
+        if self.bib[1].estado == LIBRE:
             return 1
         return None
 
     def _elige_transaccion(self, rnd_val):
         """
         A partir de un rnd en [0,1):
-        - si cae en pedir -> 'Pedir'
-        - si cae en devolver -> 'Devolver'
-        - si cae en consultar -> 'Consultar'
-        """
-        if rnd_val < self.p_pedir:
-            return "Pedir"
-        elif rnd_val < self.p_pedir + self.p_devolver:
-            return "Devolver"
-        else:
-            return "Consultar"
+        - si cae en pedir -> PEDIR
+        - si cae en devolver -> DEVOLVER
+        - si cae en consultar -> CONSULTAR
+        La posición del rnd en la tabla acumulada es directamente el código.
+        """
+        return bisect.bisect_right(self._cum_motivos, rnd_val)
 
     def _sortear_transaccion_si_falta(self, cliente: Cliente):
         """
         Si el cliente todavía no tiene acción_actual,
         sorteamos su primera transacción y la guardamos.
-        Devuelve (rnd_trx, tipo_trx) como strings para registrar en la fila.
+        Devuelve (rnd_trx, tipo_trx) para registrar en la fila
+        (rnd_trx crudo, se formatea al mostrarse; tipo_trx como texto).
         """
-        if cliente.accion_actual:
+        if cliente.accion_actual is not None:
             # Ya traía una acción en curso (ej., volvió de leer y ahora viene a "Devolver")
-            return "", cliente.accion_actual
+            return "", ACCION_STR[cliente.accion_actual]
 
-        rnd_trx_val = random.random()
+        rnd_trx_val = self._rand()
         tipo = self._elige_transaccion(rnd_trx_val)
         cliente.a_que_fue_inicial = tipo
         cliente.accion_actual = tipo
-        return fmt(rnd_trx_val, 4), tipo
+        return rnd_trx_val, ACCION_STR[tipo]
 
     def _demora_por_transaccion(self, tipo):
         """
@@ -221,15 +482,38 @@ class SimulationEngine:
         - Consultar: Uniforme(A,B)
         - Devolver: Uniforme(1.5, 2.5) (ejemplo)
         - Pedir: Exponencial(media=6)
+        Cada tipo tiene su propio pool de pares (rnd, demora) que se
+        recalcula por bloques en _rellenar_demoras.
         """
-        r = random.random()
-        if tipo == "Consultar":
-            demora = self.uni_a + (self.uni_b - self.uni_a) * r
-        elif tipo == "Devolver":
-            demora = 1.5 + r * (2.5 - 1.5)
-        else:  # "Pedir"
-            demora = -6.0 * math.log(1.0 - r)  # Exponencial media=6
-        return r, demora
+        i = self._pools_idx[tipo]
+        pool = self._pools_demora[tipo]
+        if i >= len(pool):
+            pool = self._rellenar_demoras(tipo)
+            i = 0
+        self._pools_idx[tipo] = i + 1
+        return pool[i]
+
+    def _rellenar_demoras(self, tipo):
+        """
+        Genera DEMORAS_BLOQUE pares (rnd, demora) del tipo pedido de una sola
+        pasada (así math.log y la aritmética corren en una comprensión y no
+        por evento). El pool se lee por índice (_pools_idx) y no se modifica.
+        """
+        rnd = self._rng.random
+        rs = [rnd() for _ in range(self.DEMORAS_BLOQUE)]
+        if tipo == CONSULTAR:
+            a = self.uni_a
+            ancho = self.uni_b - self.uni_a
+            demoras = [a + ancho * r for r in rs]
+        elif tipo == DEVOLVER:
+            demoras = [1.5 + r * (2.5 - 1.5) for r in rs]
+        else:  # PEDIR
+            log = math.log
+            demoras = [-6.0 * log(1.0 - r) for r in rs]  # Exponencial media=6
+
+        pool = list(zip(rs, demoras))
+        self._pools_demora[tipo] = pool
+        return pool
 
     def _tomar_de_cola(self, idx_bib):
         """
@@ -250,18 +534,34 @@ class SimulationEngine:
             return False, "", "", "", ""
 
         trx_rnd, trx_tipo = self._sortear_transaccion_si_falta(c)
-        c.estado = f"SA({idx_bib + 1})"
+        c.estado = ATENDIDO_1 + idx_bib
 
         rnd_srv, demora = self._demora_por_transaccion(c.accion_actual)
-        b.estado = "OCUPADO"
-        b.rnd = fmt(rnd_srv)
-        b.demora = fmt(demora)
+        b.estado = OCUPADO
+        b.rnd = rnd_srv
+        b.demora = demora
         b.hora_num = self.clock + demora
-        b.hora = fmt(b.hora_num)
         b.cliente_id = cid
+        self._schedule("fin_atencion", idx_bib + 1, b.hora_num)
 
         return True, b.rnd, b.demora, trx_rnd, trx_tipo
 
+    def _reset_last(self):
+        """
+        Blanquea RND / Demora de los bibliotecarios que se muestran solo
+        en la fila del evento actual.
+        """
+        self._lb1_rnd = self._lb1_dem = ""
+        self._lb2_rnd = self._lb2_dem = ""
+
+    def _set_last(self, idx_bib, rnd, demora):
+        if idx_bib == 0:
+            self._lb1_rnd = rnd
+            self._lb1_dem = demora
+        else:
+            self._lb2_rnd = rnd
+            self._lb2_dem = demora
+
     def _current_clients_occupying_spot(self):
         """
         Cantidad de clientes ocupando lugar físico en biblioteca:
@@ -269,8 +569,8 @@ class SimulationEngine:
         - siendo atendidos
         - leyendo en sala
         """
-        en_servicio = (1 if self.bib[0].estado == "OCUPADO" else 0) + \
-                      (1 if self.bib[1].estado == "OCUPADO" else 0)
+        en_servicio = (1 if self.bib[0].estado == OCUPADO else 0) + \
+                      (1 if self.bib[1].estado == OCUPADO else 0)
         return len(self.cola) + en_servicio + self.biblio_personas_cnt
 
     def _total_people_present_for_display(self):
@@ -300,6 +600,9 @@ class SimulationEngine:
         - Suma esos dt al acumulador histórico.
         - Actualiza el acumulador total de ocio de ambos.
         """
+        if self._tramos:
+            self._integrar_tramos()
+
         dt = new_time - self.last_clock
 
         # Reset valores por-iteración (para esta fila)
@@ -312,12 +615,12 @@ class SimulationEngine:
             return
 
         # Bibliotecario 1
-        if self.bib[0].estado == "LIBRE":
+        if self.bib[0].estado == LIBRE:
             self.last_iter_b1_libre = dt
             self.est_b1_libre_acum += dt  # histórico global
 
         # Bibliotecario 2
-        if self.bib[1].estado == "LIBRE":
+        if self.bib[1].estado == LIBRE:
             self.last_iter_b2_libre = dt
             self.est_b2_libre_acum += dt  # histórico global
 
@@ -327,36 +630,72 @@ class SimulationEngine:
         # Avanzamos marcador temporal
         self.last_clock = new_time
 
+    def _integrar_tramos(self):
+        """
+        Integra de una sola pasada los tramos que registraron los eventos
+        procesados sin fila (run_batch). Hace las mismas cuentas que
+        _integrar_estadisticas_hasta y en el mismo orden, así que los
+        acumuladores quedan idénticos.
+        """
+        tramos = self._tramos
+        self._tramos = []
+
+        last = self.last_clock
+        acum1 = self.est_b1_libre_acum
+        acum2 = self.est_b2_libre_acum
+        it1 = it2 = 0.0
+        for t, libre1, libre2 in tramos:
+            dt = t - last
+            it1 = it2 = 0.0
+            if dt > 0:
+                if libre1:
+                    it1 = dt
+                    acum1 += dt
+                if libre2:
+                    it2 = dt
+                    acum2 += dt
+            last = t
+
+        self.est_b1_libre_acum = acum1
+        self.est_b2_libre_acum = acum2
+        self.est_bib_ocioso_acum = acum1 + acum2
+        self.last_iter_b1_libre = it1
+        self.last_iter_b2_libre = it2
+        self.last_clock = last
+
     def _proximo_evento(self):
         """
-        Devuelve el próximo evento como tupla (t, prioridad, tipo, data).
+        Devuelve el próximo evento como tupla (t, prioridad, tipo, data),
+        sin sacarlo de la agenda.
         Prioridad para desempatar:
           1 FIN_ATENCION_1
           2 FIN_ATENCION_2
-          3 FIN_LECTURA (offset por ID)
+          3 FIN_LECTURA (desempata por ID)
           4 LLEGADA_CLIENTE
         """
-        cand = []
-
-        # Fines de atención
-        if self.bib[0].hora_num is not None:
-            cand.append((self.bib[0].hora_num, 1, "fin_atencion", {"i": 1}))
-        if self.bib[1].hora_num is not None:
-            cand.append((self.bib[1].hora_num, 2, "fin_atencion", {"i": 2}))
-
-        # Fines de lectura
-        for cid, c in self.clientes.items():
-            if c.estado == "LB" and c.fin_lect_num is not None:
-                cand.append((c.fin_lect_num, 3 + cid * 1e-6, "fin_lectura", {"cid": cid}))
-
-        # Próxima llegada
-        if self.next_arrival is not None:
-            cand.append((self.next_arrival, 4, "llegada", {}))
-
-        if not cand:
+        events = self._events
+        while events:
+            t, prio, ident, gen, tipo = events[0]
+            if self._gen.get((tipo, ident)) == gen:
+                break
+            heapq.heappop(events)  # entrada vieja (reprogramada o ya disparada)
+        else:
             return None
 
-        return min(cand, key=lambda x: (x[0], x[1]))
+        if tipo == "fin_atencion":
+            data = {"i": ident}
+        elif tipo == "fin_lectura":
+            data = {"cid": ident}
+        else:
+            data = {}
+        return t, prio, tipo, data
+
+    def _consumir_evento(self):
+        """
+        Saca de la agenda el evento que devolvió _proximo_evento.
+        """
+        t, prio, ident, gen, tipo = heapq.heappop(self._events)
+        del self._gen[(tipo, ident)]
 
     def hay_mas(self):
         self._clear_destroyed_clients()
@@ -368,9 +707,13 @@ class SimulationEngine:
 
 
     # ---------- snapshots / métricas para la UI ----------
+    # Lo que se muestra de un cliente destruido es siempre lo mismo
+    _SNAP_DESTRUCCION = (ESTADO_CLI_STR[DESTRUCCION], "", "", "")
+
     def build_client_snapshot(self):
             """
-            Snapshot para las columnas dinámicas Cliente N.
+            Snapshot para las columnas dinámicas Cliente N:
+            {cid: (estado, hora_llegada, a_que_fue, cuando_termina)}.
 
             Reglas de visualización por estado:
 
@@ -389,38 +732,34 @@ class SimulationEngine:
             """
             snap = {}
             for cid, c in self.clientes.items():
-                if c.estado == "DESTRUCCION":
-                    snap[cid] = {
-                        "estado": c.estado,
-                        "hora_llegada": "",
-                        "a_que_fue": "",
-                        "cuando_termina": "",
-                    }
-
-                elif c.estado == "LB":
-                    snap[cid] = {
-                        "estado": c.estado,
-                        "hora_llegada": fmt(c.hora_llegada, 2),
-                        "a_que_fue": "",  # <- pedido: no mostrar el "a qué fue" en LB
-                        "cuando_termina": c.cuando_termina_leer,
-                    }
+                if c.estado == DESTRUCCION:
+                    snap[cid] = self._SNAP_DESTRUCCION
+
+                elif c.estado == LEYENDO:
+                    snap[cid] = (
+                        ESTADO_CLI_STR[c.estado],
+                        fmt(c.hora_llegada, 2),
+                        "",  # <- pedido: no mostrar el "a qué fue" en LB
+                        fmt(c.fin_lect_num, 2),
+                    )
 
                 else:
-                    snap[cid] = {
-                        "estado": c.estado,
-                        "hora_llegada": fmt(c.hora_llegada, 2),
-                        "a_que_fue": c.accion_actual or c.a_que_fue_inicial,
-                        "cuando_termina": c.cuando_termina_leer,
-                    }
+                    accion = c.accion_actual if c.accion_actual is not None else c.a_que_fue_inicial
+                    snap[cid] = (
+                        ESTADO_CLI_STR[c.estado],
+                        fmt(c.hora_llegada, 2),
+                        "" if accion is None else ACCION_STR[accion],
+                        c.cuando_termina_leer,
+                    )
 
             return snap
-    
-
 
     def snapshot_estadisticas(self):
         """
         Datos para la ventanita de Estadísticas (promedios globales).
         """
+        if self._tramos:
+            self._integrar_tramos()
         prom_permanencia = (
             self.sum_tiempo_en_sistema / self.cli_completados
             if self.cli_completados > 0
@@ -438,17 +777,21 @@ class SimulationEngine:
         """
         Integra hasta time_limit si quedaba un tramo final.
         """
+        if self._tramos:
+            self._integrar_tramos()
         if not self._finalizado and self.last_clock < self.time_limit:
             self._integrar_estadisticas_hasta(self.time_limit)
         self._finalizado = True
         return self.snapshot_estadisticas()
 
     # ---------- EVENTOS PRINCIPALES ----------
-    def siguiente_evento(self):
+    def siguiente_evento(self, build_row=True):
         """
         Avanza 1 evento y devuelve:
-         - row_dict (para columnas base de la fila nueva)
+         - row (lista con las columnas base de la fila nueva, ver COL_NAMES)
          - cli_snap (para columnas Cliente N)
+        Con build_row=False solo avanza el estado y las estadísticas,
+        sin armar la fila, y devuelve None.
         """
         self._clear_destroyed_clients()
 
@@ -459,23 +802,52 @@ class SimulationEngine:
         if t > self.time_limit:
             raise StopIteration("Se alcanzó el tiempo límite X.")
 
+        self._consumir_evento()
         if tipo == "llegada":
-            row, snap = self._evento_llegada()
+            row, snap = self._evento_llegada(build_row)
         elif tipo == "fin_atencion":
-            row, snap = self._evento_fin_atencion(data["i"])
+            row, snap = self._evento_fin_atencion(data["i"], build_row)
         else:
-            row, snap = self._evento_fin_lectura(data["cid"])
+            row, snap = self._evento_fin_lectura(data["cid"], build_row)
 
+        if not build_row:
+            return None
         return row, snap
 
-    def _evento_llegada(self):
+    def run_batch(self, n_events):
+        """
+        Avanza hasta n_events eventos seguidos, sin pasar por la UI.
+        Sirve para la parte de la simulación que ya no se muestra en la tabla.
+        Devuelve (procesados, ultima) donde ultima es el (row, cli_snap)
+        del último evento procesado (o None si no se procesó ninguno).
+        """
+        hay_mas = self.hay_mas
+        siguiente = self.siguiente_evento
+        ultima = None
+        procesados = 0
+        while procesados < n_events and hay_mas():
+            # Solo puede ser el último evento si la próxima llegada queda
+            # fuera de X; recién ahí vale la pena armar la fila.
+            r = siguiente(build_row=self.next_arrival + self.t_inter > self.time_limit)
+            if r is not None:
+                ultima = r
+            procesados += 1
+        if self._tramos:
+            self._integrar_tramos()
+        return procesados, ultima
+
+    def _evento_llegada(self, build_row=True):
         """
         Evento: LLEGADA_CLIENTE
         """
         t = self.next_arrival
 
         # Integramos estadística de ocio desde last_clock hasta t
-        self._integrar_estadisticas_hasta(t)
+        if build_row:
+            self._integrar_estadisticas_hasta(t)
+        else:
+            # Sin fila: solo se anota el tramo y se integra después en bloque
+            self._tramos.append((t, self.bib[0].estado == LIBRE, self.bib[1].estado == LIBRE))
 
         # Avanzamos
         self.iteration += 1
@@ -485,8 +857,7 @@ class SimulationEngine:
         event_perm_sum = 0.0
 
         # Limpiamos registros de bibliotecarios que mostramos solo en ESTA fila
-        self.last_b[1].update({"rnd": "", "demora": "", "trx_rnd": "", "trx_tipo": ""})
-        self.last_b[2].update({"rnd": "", "demora": "", "trx_rnd": "", "trx_tipo": ""})
+        self._reset_last()
 
         # Creamos nuevo cliente
         cid = self.next_client_id
@@ -499,7 +870,7 @@ class SimulationEngine:
         # Chequeo de capacidad física
         if self._current_clients_occupying_spot() >= (MAX_CAPACITY - 2):
             # No entra → destruido inmediatamente
-            c.estado = "DESTRUCCION"
+            c.estado = DESTRUCCION
             c.fin_lect_num = None
             c.cuando_termina_leer = "CLIENTE DESTRUIDO (CAPACIDAD MAXIMA)"
             self.clientes[cid] = c
@@ -521,25 +892,22 @@ class SimulationEngine:
             if (not self._hay_cola()) and (libre is not None):
                 # Pasa directo con bibliotecario libre
                 trx_rnd, trx_tipo = self._sortear_transaccion_si_falta(c)
-                c.estado = f"SA({libre + 1})"
+                c.estado = ATENDIDO_1 + libre
 
                 rnd_srv, demora = self._demora_por_transaccion(c.accion_actual)
                 b = self.bib[libre]
-                b.estado = "OCUPADO"
-                b.rnd = fmt(rnd_srv)
-                b.demora = fmt(demora)
+                b.estado = OCUPADO
+                b.rnd = rnd_srv
+                b.demora = demora
                 b.hora_num = self.clock + demora
-                b.hora = fmt(b.hora_num)
                 b.cliente_id = c.id
+                self._schedule("fin_atencion", libre + 1, b.hora_num)
 
                 # Para mostrar SOLO en esta fila
-                self.last_b[libre + 1]["rnd"] = b.rnd
-                self.last_b[libre + 1]["demora"] = b.demora
-                self.last_b[libre + 1]["trx_rnd"] = trx_rnd
-                self.last_b[libre + 1]["trx_tipo"] = trx_tipo
+                self._set_last(libre, b.rnd, b.demora)
             else:
                 # Va a cola
-                c.estado = "EN COLA"
+                c.estado = EN_COLA
                 c.hora_entrada_cola = self.clock
                 self.cola.append(c.id)
 
@@ -547,6 +915,7 @@ class SimulationEngine:
 
         # Programo próxima llegada
         self.next_arrival = self.clock + self.t_inter
+        self._schedule("llegada", 0, self.next_arrival)
 
         # Actualizo estado de biblioteca
         self._update_biblio_estado()
@@ -555,43 +924,42 @@ class SimulationEngine:
         # Sumo al acumulador global SOLO lo que salió en este evento
         self.cli_perm_acum_total += event_perm_sum
 
-        row = {
-            "evento": f"LLEGADA_CLIENTE({cid})",
-            "reloj": fmt(self.clock, 2),
-            "lleg_tiempo": fmt(self.t_inter, 2),
-            "lleg_minuto": fmt(self.next_arrival, 2),
-            "lleg_id": str(cid),
-            "trx_rnd": trx_rnd,
-            "trx_tipo": trx_tipo,
-            "lee_rnd": "",
-            "lee_lugar": "",
-            "lee_tiempo": "",
-            "lee_fin": "",
-            "b1_estado": self.bib[0].estado,
-            "b1_rnd": self.last_b[1]["rnd"],
-            "b1_demora": self.last_b[1]["demora"],
-            "b1_hora": self.bib[0].hora,
-            "b2_estado": self.bib[1].estado,
-            "b2_rnd": self.last_b[2]["rnd"],
-            "b2_demora": self.last_b[2]["demora"],
-            "b2_hora": self.bib[1].hora,
-            "cola": len(self.cola),
-            "biblio_estado": self.biblio_estado,
-            "biblio_personas": self._total_people_present_for_display(),
-            # --- estadísticas solicitadas en la tabla ---
-            # Libre por iteración (dt de ESTA iteración, o 0)
-            "est_b1_libre": fmt(self.last_iter_b1_libre),
-            "est_b2_libre": fmt(self.last_iter_b2_libre),
-            # Acumulador histórico total de ocio (B1+B2)
-            "est_bib_ocioso_acum": fmt(self.est_bib_ocioso_acum),
-            # Acumulador histórico de permanencia clientes destruidos
-            "est_cli_perm_acum": fmt(self.cli_perm_acum_total),
-        }
+        if not build_row:
+            return None, None
+
+        row = [
+            self.iteration,  # iteracion
+            f"LLEGADA_CLIENTE({cid})",  # evento
+            self.clock,  # reloj
+            self.t_inter,  # lleg_tiempo
+            self.next_arrival,  # lleg_minuto
+            trx_rnd,  # trx_rnd
+            trx_tipo,  # trx_tipo
+            "",  # lee_rnd
+            "",  # lee_lugar
+            "",  # lee_tiempo
+            "",  # lee_fin
+            ESTADO_BIB_STR[self.bib[0].estado],  # b1_estado
+            self._lb1_rnd,  # b1_rnd
+            self._lb1_dem,  # b1_demora
+            self.bib[0].hora_num,  # b1_hora
+            ESTADO_BIB_STR[self.bib[1].estado],  # b2_estado
+            self._lb2_rnd,  # b2_rnd
+            self._lb2_dem,  # b2_demora
+            self.bib[1].hora_num,  # b2_hora
+            len(self.cola),  # cola
+            self.biblio_estado,  # biblio_estado
+            self._total_people_present_for_display(),  # biblio_personas
+            self.last_iter_b1_libre,  # est_b1_libre
+            self.last_iter_b2_libre,  # est_b2_libre
+            self.est_bib_ocioso_acum,  # est_bib_ocioso_acum
+            self.cli_perm_acum_total,  # est_cli_perm_acum
+        ]
 
         cli_snap = self.build_client_snapshot()
         return row, cli_snap
 
-    def _evento_fin_atencion(self, i):
+    def _evento_fin_atencion(self, i, build_row=True):
             """
             Evento: FIN_ATENCION_i
             """
@@ -600,7 +968,11 @@ class SimulationEngine:
             t = b.hora_num
 
             # Integramos ocio hasta este tiempo
-            self._integrar_estadisticas_hasta(t)
+            if build_row:
+                self._integrar_estadisticas_hasta(t)
+            else:
+                # Sin fila: solo se anota el tramo y se integra después en bloque
+                self._tramos.append((t, self.bib[0].estado == LIBRE, self.bib[1].estado == LIBRE))
 
             # Avanzamos
             self.iteration += 1
@@ -610,8 +982,7 @@ class SimulationEngine:
             event_perm_sum = 0.0
 
             # Reset columnas de bibliotecarios para ESTA fila
-            self.last_b[1].update({"rnd": "", "demora": "", "trx_rnd": "", "trx_tipo": ""})
-            self.last_b[2].update({"rnd": "", "demora": "", "trx_rnd": "", "trx_tipo": ""})
+            self._reset_last()
 
             cid = b.cliente_id
             c = self.clientes[cid]
@@ -623,15 +994,15 @@ class SimulationEngine:
             lee_fin = ""
 
             # Después de la atención, depende de la acción
-            if c.accion_actual == "Pedir":
+            if c.accion_actual == PEDIR:
                 # Decide si se lo lleva o se queda leyendo
-                r = random.random()
-                lee_rnd = fmt(r, 4)
+                r = self._rand()
+                lee_rnd = r
 
                 if r < self.p_retira:
                     # CASO 1: Se lo lleva para leer en su casa
                     # → pasa directo a destrucción
-                    c.estado = "DESTRUCCION"
+                    c.estado = DESTRUCCION
                     c.fin_lect_num = None
                     c.cuando_termina_leer = ""
 
@@ -650,21 +1021,21 @@ class SimulationEngine:
 
                 else:
                     # CASO 2: Se queda a leer en biblioteca
-                    c.estado = "LB"
+                    c.estado = LEYENDO
                     fin_lec = self.clock + self.t_lect_biblio
                     c.fin_lect_num = fin_lec
-                    c.cuando_termina_leer = fmt(fin_lec, 2)
+                    self._schedule("fin_lectura", cid, fin_lec)
 
                     lee_lugar = "Biblioteca"
-                    lee_tiempo = fmt(self.t_lect_biblio, 2)
-                    lee_fin = c.cuando_termina_leer
+                    lee_tiempo = self.t_lect_biblio
+                    lee_fin = fin_lec
 
                     # ahora ocupa una mesa en sala de lectura
                     self.biblio_personas_cnt += 1
 
             else:
                 # Devolver / Consultar ⇒ se va del sistema
-                c.estado = "DESTRUCCION"
+                c.estado = DESTRUCCION
                 c.fin_lect_num = None
                 c.cuando_termina_leer = ""
 
@@ -678,20 +1049,16 @@ class SimulationEngine:
                 self._to_clear_after_emit.add(c.id)
 
             # Bibliotecario queda libre
-            b.estado = "LIBRE"
+            b.estado = LIBRE
             b.rnd = ""
             b.demora = ""
-            b.hora = ""
             b.hora_num = None
             b.cliente_id = None
 
             # Intenta agarrar siguiente en cola
             asigno, rnd_b, demora_b, trx_rnd, trx_tipo = self._tomar_de_cola(idx)
             if asigno:
-                self.last_b[i]["rnd"] = rnd_b
-                self.last_b[i]["demora"] = demora_b
-                self.last_b[i]["trx_rnd"] = trx_rnd
-                self.last_b[i]["trx_tipo"] = trx_tipo
+                self._set_last(idx, rnd_b, demora_b)
 
             # Actualizamos estado biblioteca
             self._update_biblio_estado()
@@ -699,45 +1066,43 @@ class SimulationEngine:
             # >>>>> acumulador histórico de permanencia de clientes <<<<<
             self.cli_perm_acum_total += event_perm_sum
 
-            row = {
-                "evento": f"FIN_ATENCION_{i}({cid})",
-                "reloj": fmt(self.clock, 2),
-                "lleg_tiempo": "",
-                "lleg_minuto": fmt(self.next_arrival, 2),
-                "lleg_id": "",
-                "trx_rnd": self.last_b[i]["trx_rnd"],
-                "trx_tipo": self.last_b[i]["trx_tipo"],
-
-                # ¿Dónde Lee?
-                "lee_rnd": lee_rnd,
-                "lee_lugar": lee_lugar,     # <- ahora puede ser "Biblioteca" o "Casa"
-                "lee_tiempo": lee_tiempo,   # si "Casa", queda ""
-                "lee_fin": lee_fin,         # si "Casa", queda ""
-
-                "b1_estado": self.bib[0].estado,
-                "b1_rnd": self.last_b[1]["rnd"],
-                "b1_demora": self.last_b[1]["demora"],
-                "b1_hora": self.bib[0].hora,
-                "b2_estado": self.bib[1].estado,
-                "b2_rnd": self.last_b[2]["rnd"],
-                "b2_demora": self.last_b[2]["demora"],
-                "b2_hora": self.bib[1].hora,
-                "cola": len(self.cola),
-                "biblio_estado": self.biblio_estado,
-                "biblio_personas": self._total_people_present_for_display(),
-
-                # estadísticas pedidas:
-                "est_b1_libre": fmt(self.last_iter_b1_libre),
-                "est_b2_libre": fmt(self.last_iter_b2_libre),
-                "est_bib_ocioso_acum": fmt(self.est_bib_ocioso_acum),
-                "est_cli_perm_acum": fmt(self.cli_perm_acum_total),
-            }
+            if not build_row:
+                return None, None
+
+            row = [
+                self.iteration,  # iteracion
+                f"FIN_ATENCION_{i}({cid})",  # evento
+                self.clock,  # reloj
+                "",  # lleg_tiempo
+                self.next_arrival,  # lleg_minuto
+                trx_rnd,  # trx_rnd
+                trx_tipo,  # trx_tipo
+                lee_rnd,  # lee_rnd
+                lee_lugar,  # lee_lugar
+                lee_tiempo,  # lee_tiempo
+                lee_fin,  # lee_fin
+                ESTADO_BIB_STR[self.bib[0].estado],  # b1_estado
+                self._lb1_rnd,  # b1_rnd
+                self._lb1_dem,  # b1_demora
+                self.bib[0].hora_num,  # b1_hora
+                ESTADO_BIB_STR[self.bib[1].estado],  # b2_estado
+                self._lb2_rnd,  # b2_rnd
+                self._lb2_dem,  # b2_demora
+                self.bib[1].hora_num,  # b2_hora
+                len(self.cola),  # cola
+                self.biblio_estado,  # biblio_estado
+                self._total_people_present_for_display(),  # biblio_personas
+                self.last_iter_b1_libre,  # est_b1_libre
+                self.last_iter_b2_libre,  # est_b2_libre
+                self.est_bib_ocioso_acum,  # est_bib_ocioso_acum
+                self.cli_perm_acum_total,  # est_cli_perm_acum
+            ]
 
             cli_snap = self.build_client_snapshot()
             return row, cli_snap
 
 
-    def _evento_fin_lectura(self, cid):
+    def _evento_fin_lectura(self, cid, build_row=True):
         """
         FIN_LECTURA(cid):
         El cliente terminó de leer en la sala y ahora debe devolver.
@@ -746,7 +1111,11 @@ class SimulationEngine:
         t = c.fin_lect_num
 
         # Integramos ocio hasta este tiempo
-        self._integrar_estadisticas_hasta(t)
+        if build_row:
+            self._integrar_estadisticas_hasta(t)
+        else:
+            # Sin fila: solo se anota el tramo y se integra después en bloque
+            self._tramos.append((t, self.bib[0].estado == LIBRE, self.bib[1].estado == LIBRE))
 
         # Avanzamos
         self.iteration += 1
@@ -757,34 +1126,30 @@ class SimulationEngine:
         # así que en esta iteración será 0.
         event_perm_sum = 0.0
 
-        self.last_b[1].update({"rnd": "", "demora": "", "trx_rnd": "", "trx_tipo": ""})
-        self.last_b[2].update({"rnd": "", "demora": "", "trx_rnd": "", "trx_tipo": ""})
+        self._reset_last()
 
         # pasa de leer a devolver
         c.fin_lect_num = None
         c.cuando_termina_leer = ""
-        c.accion_actual = "Devolver"
+        c.accion_actual = DEVOLVER
         # Ya no ocupa mesa de lectura
         self.biblio_personas_cnt = max(0, self.biblio_personas_cnt - 1)
 
         libre = self._primer_bib_libre()
         if libre is not None:
-            c.estado = f"SA({libre + 1})"
+            c.estado = ATENDIDO_1 + libre
             rnd_srv, demora = self._demora_por_transaccion(c.accion_actual)
             b = self.bib[libre]
-            b.estado = "OCUPADO"
-            b.rnd = fmt(rnd_srv)
-            b.demora = fmt(demora)
+            b.estado = OCUPADO
+            b.rnd = rnd_srv
+            b.demora = demora
             b.hora_num = self.clock + demora
-            b.hora = fmt(b.hora_num)
             b.cliente_id = c.id
+            self._schedule("fin_atencion", libre + 1, b.hora_num)
 
-            self.last_b[libre + 1]["rnd"] = b.rnd
-            self.last_b[libre + 1]["demora"] = b.demora
-            self.last_b[libre + 1]["trx_rnd"] = ""
-            self.last_b[libre + 1]["trx_tipo"] = "Devolver"
+            self._set_last(libre, b.rnd, b.demora)
         else:
-            c.estado = "EN COLA"
+            c.estado = EN_COLA
             c.hora_entrada_cola = self.clock
             self.cola.append(c.id)
 
@@ -794,34 +1159,37 @@ class SimulationEngine:
         # así que el acumulador histórico de permanencia NO aumenta
         self.cli_perm_acum_total += event_perm_sum  # suma 0 igual, para claridad
 
-        row = {
-            "evento": f"FIN_LECTURA({cid})",
-            "reloj": fmt(self.clock, 2),
-            "lleg_tiempo": "",
-            "lleg_minuto": fmt(self.next_arrival, 2),
-            "lleg_id": "",
-            "trx_rnd": "" if libre is None else self.last_b[libre + 1]["trx_rnd"],
-            "trx_tipo": "" if libre is None else self.last_b[libre + 1]["trx_tipo"],
-            "lee_rnd": "",
-            "lee_lugar": "",
-            "lee_tiempo": "",
-            "lee_fin": "",
-            "b1_estado": self.bib[0].estado,
-            "b1_rnd": self.last_b[1]["rnd"],
-            "b1_demora": self.bib[0].demora,
-            "b1_hora": self.bib[0].hora,
-            "b2_estado": self.bib[1].estado,
-            "b2_rnd": self.last_b[2]["rnd"],
-            "b2_demora": self.bib[1].demora,
-            "b2_hora": self.bib[1].hora,
-            "cola": len(self.cola),
-            "biblio_estado": self.biblio_estado,
-            "biblio_personas": self._total_people_present_for_display(),
-            "est_b1_libre": fmt(self.last_iter_b1_libre),
-            "est_b2_libre": fmt(self.last_iter_b2_libre),
-            "est_bib_ocioso_acum": fmt(self.est_bib_ocioso_acum),
-            "est_cli_perm_acum": fmt(self.cli_perm_acum_total),
-        }
+        if not build_row:
+            return None, None
+
+        row = [
+            self.iteration,  # iteracion
+            f"FIN_LECTURA({cid})",  # evento
+            self.clock,  # reloj
+            "",  # lleg_tiempo
+            self.next_arrival,  # lleg_minuto
+            "",  # trx_rnd (ya traía la acción, no se sortea)
+            "" if libre is None else ACCION_STR[DEVOLVER],  # trx_tipo
+            "",  # lee_rnd
+            "",  # lee_lugar
+            "",  # lee_tiempo
+            "",  # lee_fin
+            ESTADO_BIB_STR[self.bib[0].estado],  # b1_estado
+            self._lb1_rnd,  # b1_rnd
+            self.bib[0].demora,  # b1_demora
+            self.bib[0].hora_num,  # b1_hora
+            ESTADO_BIB_STR[self.bib[1].estado],  # b2_estado
+            self._lb2_rnd,  # b2_rnd
+            self.bib[1].demora,  # b2_demora
+            self.bib[1].hora_num,  # b2_hora
+            len(self.cola),  # cola
+            self.biblio_estado,  # biblio_estado
+            self._total_people_present_for_display(),  # biblio_personas
+            self.last_iter_b1_libre,  # est_b1_libre
+            self.last_iter_b2_libre,  # est_b2_libre
+            self.est_bib_ocioso_acum,  # est_bib_ocioso_acum
+            self.cli_perm_acum_total,  # est_cli_perm_acum
+        ]
 
         cli_snap = self.build_client_snapshot()
         return row, cli_snap
@@ -829,7 +1197,7 @@ class SimulationEngine:
 
 # ----------------- Ventana de Estadísticas -----------------
 class StatsWindow(tk.Toplevel):
-    def __init__(self, master, engine: SimulationEngine):
+    def __init__(self, master, engine: SimulationEngine, stats=None):
         super().__init__(master)
         self.title("Estadísticas")
         self.geometry("360x210")
@@ -854,10 +1222,12 @@ class StatsWindow(tk.Toplevel):
         self.lbl_tot = ttk.Label(frm, text="Ocioso TOTAL: 0.00 min")
         self.lbl_tot.pack(anchor="w", pady=(2, 0))
 
-        self.refresh()
+        self.refresh(stats=stats)
 
-    def refresh(self, final=False):
-        stats = self.engine.finalizar_estadisticas() if final else self.engine.snapshot_estadisticas()
+    def refresh(self, final=False, stats=None):
+        # stats ya calculadas (ej. mientras el motor corre en otro hilo)
+        if stats is None:
+            stats = self.engine.finalizar_estadisticas() if final else self.engine.snapshot_estadisticas()
         self.lbl_cli.configure(text=f"Clientes completados: {stats['clientes_completados']}")
         self.lbl_prom.configure(text=f"Promedio permanencia: {stats['prom_permanencia']:.2f} min")
         self.lbl_b1.configure(text=f"Ocioso B1: {stats['b1_ocioso']:.2f} min")
@@ -867,97 +1237,168 @@ class StatsWindow(tk.Toplevel):
 
 # ----------------- Ventana de Simulación (Vector de Estado) -----------------
 class SimulationWindow(tk.Toplevel):
-    
-    
-    
-    
-    
+    # Eventos que se procesan de corrido (sin refrescar la UI) una vez superado i
+    EVENTOS_POR_BLOQUE = 1000
+    # Columnas de clientes que se reservan (ocultas) de una sola vez
+    SLOTS_CLIENTES = 64
+    # Cada cuánto (ms) y cuántos mensajes levanta la UI del hilo del motor
+    DRENADO_MS = 16
+    FILAS_POR_DRENADO = 50
+    # Filas visibles que el hilo del motor junta antes de mandarlas a la UI
+    FILAS_POR_LOTE = 64
+    # Sub-columnas de cada cliente: sufijo del id, título y ancho
+    CLIENTE_CAMPOS = ("estado", "hora_llegada", "a_que_fue", "cuando_termina")
+    CLIENTE_TEXTOS = ("ESTADO", "HORA_LLEGADA", "A QUE FUE", "Cuando termina de leer")
+    CLIENTE_ANCHOS = (110, 130, 120, 180)
+
     def run_all_events(self):
         """
         Ejecuta automáticamente todos los eventos hasta finalizar.
         Solo muestra en pantalla las primeras i filas de eventos y, al final,
         inserta la última fila de la simulación.
+
+        El motor corre en un hilo aparte (_engine_loop) y deja lo que hay
+        que mostrar en self._cola_ui; la UI lo va levantando con
+        _drenar_cola_ui sin quedar congelada durante la corrida.
+        """
+        self._stats_actuales = self.engine.snapshot_estadisticas()
+        self._corriendo = True
+        q = self._cola_ui
+        threading.Thread(
+            target=self._engine_loop, args=(self.engine, q, self._stop), daemon=True
+        ).start()
+        self.after(self.DRENADO_MS, self._drenar_cola_ui, q)
+
+    def _engine_loop(self, eng, q, stop):
         """
-        while True:
-            try:
-                if not self.engine.hay_mas():
-                    # Fin: integrar últimas estadísticas y abrir stats
-                    self.engine.finalizar_estadisticas()
-
-                    # Si superamos i y guardamos la última fila, insertarla ahora
-                    if self._final_row_cache and not self._inserted_final:
-                        row_f, snap_f = self._final_row_cache
-                        # Asegurar columnas de todos los clientes que existan en el último snapshot
-                        for cid in sorted(snap_f.keys()):
-                            self._ensure_client_columns(cid)
-                        values = self._build_row_values(row_f, snap_f)
-                        tag = 'evenrow' if self.engine.iteration % 2 == 0 else 'oddrow'
-                        self.tree.insert("", "end", values=values, tags=(tag,))
-                        self._draw_group_headers()
-                        self._inserted_final = True
-
-                    self.open_stats()
-                    self._refresh_stats_window(final=True)
-                    messagebox.showinfo("Fin de simulación", "Se completó toda la simulación.")
-                    break
-
-                row, cli_snap = self.engine.siguiente_evento()
-
-                if self._rows_shown < self.i_limit:
-                    # Asegurar columnas solo para lo que se va a mostrar
-                    for cid in sorted(cli_snap.keys()):
-                        self._ensure_client_columns(cid)
-
-                    values = self._build_row_values(row, cli_snap)
-                    tag = 'evenrow' if self.engine.iteration % 2 == 0 else 'oddrow'
-                    self.tree.insert("", "end", values=values, tags=(tag,))
-                    self._rows_shown += 1
-                    self._draw_group_headers()
+        Hilo del motor: genera las primeras i filas y después avanza el
+        resto en bloques. Mientras corre es el único que toca `eng`;
+        a la UI solo le llegan mensajes (tipo, dato, extra) por `q`.
+        Recibe motor, cola y evento de corte propios, así una corrida
+        vieja (ver update_config) no se mezcla con la nueva.
+        """
+        filas = 0
+        lote = []  # filas visibles que se mandan juntas a la UI
+        mensaje = "Se completó toda la simulación."
+        try:
+            while not stop.is_set() and eng.hay_mas():
+                if filas < self.i_limit:
+                    lote.append(eng.siguiente_evento())
+                    filas += 1
+                    if len(lote) >= self.FILAS_POR_LOTE:
+                        q.put(("filas", lote, None))
+                        lote = []
                 else:
-                    # No insertamos más filas: cacheamos la última que va pasando
-                    self._final_row_cache = (row, cli_snap)
-
-                self._refresh_stats_window(final=False)
-
-            except StopIteration:
-                # Igual que arriba: insertar última fila si corresponde
-                self.engine.finalizar_estadisticas()
-                if self._final_row_cache and not self._inserted_final:
-                    row_f, snap_f = self._final_row_cache
-                    for cid in sorted(snap_f.keys()):
-                        self._ensure_client_columns(cid)
-                    values = self._build_row_values(row_f, snap_f)
-                    tag = 'evenrow' if self.engine.iteration % 2 == 0 else 'oddrow'
-                    self.tree.insert("", "end", values=values, tags=(tag,))
-                    self._draw_group_headers()
-                    self._inserted_final = True
-
-                self.open_stats()
-                self._refresh_stats_window(final=True)
-                messagebox.showinfo("Fin de simulación", "Se alcanzó el tiempo límite X.")
+                    if lote:
+                        q.put(("filas", lote, None))
+                        lote = []
+                    # Ya no se insertan filas: avanzamos en bloque y solo
+                    # nos quedamos con la última fila procesada
+                    _, ultima = eng.run_batch(self.EVENTOS_POR_BLOQUE)
+                    if ultima is not None:
+                        q.put(("ultima", ultima, None))
+                    q.put(("stats", eng.snapshot_estadisticas(), None))
+        except StopIteration:
+            mensaje = "Se alcanzó el tiempo límite X."
+        if lote:
+            q.put(("filas", lote, None))
+        q.put(("fin", eng.finalizar_estadisticas(), mensaje))
+
+    def _drenar_cola_ui(self, q):
+        """
+        Lado Tk: pasa a la tabla lo que dejó el hilo del motor, de a
+        FILAS_POR_DRENADO mensajes (lotes de filas, stats, fin) cada DRENADO_MS.
+        """
+        if not self.winfo_exists() or q is not self._cola_ui:
+            return  # ventana cerrada o corrida reemplazada por update_config
+        try:
+            for _ in range(self.FILAS_POR_DRENADO):
+                tipo, dato, extra = q.get_nowait()
+                if tipo == "filas":
+                    # Un lote entero de una pasada; el header se redibuja una vez
+                    self._insertar_filas(dato)
+                    self._rows_shown += len(dato)
+                elif tipo == "ultima":
+                    self._final_row_cache = dato
+                elif tipo == "stats":
+                    self._stats_actuales = dato
+                    self._refresh_stats_window(stats=dato)
+                else:  # "fin"
+                    self._terminar_corrida(extra)
+                    return
+        except queue.Empty:
+            pass
+        self.after(self.DRENADO_MS, self._drenar_cola_ui, q)
 
-                break
+    def _terminar_corrida(self, mensaje):
+        # El hilo terminó: desde acá la UI ya puede leer el motor directo
+        self._corriendo = False
+        self._stats_actuales = None
+
+        # Si superamos i y guardamos la última fila, insertarla ahora
+        if self._final_row_cache and not self._inserted_final:
+            self._insertar_fila(*self._final_row_cache)
+            self._inserted_final = True
+
+        self.open_stats()
+        self._refresh_stats_window(final=True)
+        from tkinter import messagebox
+        messagebox.showinfo("Fin de simulación", mensaje)
 
+    def _insertar_fila(self, row, cli_snap):
+        self._insertar_filas(((row, cli_snap),))
+
+    def _insertar_filas(self, lote):
+        """
+        Inserta un lote de filas (row, cli_snap) de una pasada: primero se
+        muestran las columnas de todos los clientes del lote, después se
+        arman las tuplas de valores y recién al final se hacen los inserts,
+        sin nada más entre uno y otro. El header se pide una sola vez.
+        """
+        cids = set()
+        for _, cli_snap in lote:
+            cids.update(cli_snap)
+        for cid in sorted(cids):
+            self._ensure_client_columns(cid)
+
+        filas = [
+            (tuple(self._build_row_values(row, cli_snap)),
+             ('evenrow',) if row[0] % 2 == 0 else ('oddrow',))
+            for row, cli_snap in lote
+        ]
+        insert = self.tree.insert
+        for values, tags in filas:
+            insert("", "end", values=values, tags=tags)
+        self._pedir_group_headers()
+
+    def _on_close(self):
+        # Cortamos el hilo del motor (si está corriendo) antes de cerrar
+        self._stop.set()
+        self.destroy()
 
-    
     def __init__(self, master, config_dict):
         super().__init__(master)
         self.title("Vector de Estado - Simulación (Streaming memoria optimizada)")
         self.geometry("1400x760")
         self.minsize(1200, 560)
 
-        self.engine = SimulationEngine(config_dict)
-        self.modo_auto = bool(config_dict["simulacion"].get("modo_auto", False))
         self.stats_win = None
-        self.known_clients = [] 
-        self.layout_clientes_fijo = bool(config_dict["simulacion"].get("layout_clientes_fijo", True))
-        self.max_clientes_fijos  = int(config_dict["simulacion"].get("max_clientes_fijos", 20))  # 20 = cap de personas en sala
-
-        # Ventana deslizante de visualización
-        self.i_limit = int(config_dict["simulacion"]["mostrar_vector_estado"]["i_iteraciones"])
-        self._rows_shown = 0                 # filas de eventos ya insertadas (no cuenta INICIALIZACION)
-        self._final_row_cache = None         # (row, cli_snap) de la última fila de la simulación
-        self._inserted_final = False         # bandera para no duplicar la última fila
+        self.known_clients = []
+        self._known_clients_set = set()
+        self._headers_pendientes = False     # redibujo de grupos ya agendado con after_idle
+        self._xs = None                      # cache de _col_x_positions (None = recalcular)
+        # Ítems ya creados en el header de grupos (se reubican, no se recrean)
+        self._group_items = []               # (rect, texto|None, línea inferior) por grupo
+        self._guide_items = []               # línea fina por columna
+        self._boundary_items = []            # línea de borde de grupo
+        self._cargar_config(config_dict)
+
+        # Modo auto: el motor corre en un hilo y manda todo por esta cola
+        self._cola_ui = queue.Queue()
+        self._stop = threading.Event()
+        self._corriendo = False
+        self._stats_actuales = None          # últimas stats que mandó el hilo
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
  # clientes que ya generaron columnas
 
         root = ttk.Frame(self, padding=8)
@@ -967,34 +1408,27 @@ class SimulationWindow(tk.Toplevel):
         top = ttk.Frame(root)
         top.pack(fill="x")
 
-        resumen = ttk.Label(
-            top,
-            text=(
-                f"Config → X={config_dict['simulacion']['tiempo_limite_min']} min | "
-                f"i={config_dict['simulacion']['mostrar_vector_estado']['i_iteraciones']} "
-                f"desde j={config_dict['simulacion']['mostrar_vector_estado']['desde_minuto_j']}  "
-                f"| t_entre_llegadas={config_dict['llegadas']['tiempo_entre_llegadas_min']} min"
-            ),
-            foreground="#374151",
-        )
-        resumen.pack(side="left")
+        self._lbl_resumen = ttk.Label(top, text=self._texto_resumen(), foreground="#374151")
+        self._lbl_resumen.pack(side="left")
 
         ttk.Button(top, text="Estadísticas", command=self.open_stats).pack(side="right", padx=(6, 0))
+        # Solo en modo manual mostramos "Siguiente evento"
+        self._btn_siguiente = ttk.Button(top, text="Siguiente evento", command=self.on_next)
         if not self.modo_auto:
-            # Solo en modo manual mostramos "Siguiente evento"
-            ttk.Button(top, text="Siguiente evento", command=self.on_next).pack(side="right")
-        else:
-            # En modo auto podés querer un botón para "Pausar" o "Ejecutar todo ahora".
-            # Si querés, dejalo así de simple y que corra solo:
-            pass
+            self._btn_siguiente.pack(side="right")
 
 
         # Definición de columnas base
-        self.columns = []
+        # Columnas visibles en listas paralelas (id / texto / ancho)
+        self._col_ids = []
+        self._col_texts = []
+        self._col_widths = []
         self.groups = []
 
         def add_col(cid, text, w):
-            self.columns.append({"id": cid, "text": text, "w": w})
+            self._col_ids.append(cid)
+            self._col_texts.append(text)
+            self._col_widths.append(w)
 
         # Grupo "" (iteración / evento / reloj)
         add_col("iteracion", "Numero de iteracion", 160)
@@ -1060,6 +1494,7 @@ class SimulationWindow(tk.Toplevel):
             ("ESTADISTICAS · BIBLIOTECARIOS", 23, 25),
             ("ESTADISTICAS · CLIENTES", 26, 26),
         ]
+        self._n_grupos_base = len(self.groups)  # después vienen los "Cliente X"
 
         # --- UI: canvas de encabezado de grupos + Treeview ---
         wrapper = ttk.Frame(root)
@@ -1076,6 +1511,7 @@ class SimulationWindow(tk.Toplevel):
         self.tree = ttk.Treeview(wrapper, show="headings", height=20)
         self.tree.pack(fill="both", expand=True, side="left")
 
+        self.tree.bind("<ButtonRelease-1>", self._on_tree_release)
         self.tree.tag_configure('evenrow', background=ROW_EVEN_BG)
         self.tree.tag_configure('oddrow', background=ROW_ODD_BG)
 
@@ -1097,6 +1533,14 @@ class SimulationWindow(tk.Toplevel):
         self.tree.configure(yscrollcommand=yscroll.set, xscrollcommand=on_tree_xscroll)
         xscroll.configure(command=on_xscroll)
 
+        # Ids de columnas del Treeview, separados en base y clientes.
+        # Los valores de cada fila van en el orden base + clientes.
+        self._base_col_ids = list(self._col_ids)
+        self._client_col_ids = []   # reservadas, visibles u ocultas
+        # Las que se ven, en orden, son las de self._col_ids
+        self._client_slots = 0  # clientes con columnas ya creadas (visibles u ocultas)
+        self._reservar_columnas_clientes(self.SLOTS_CLIENTES)
+
         # Aplicar columnas al Treeview y dibujar encabezados
         # Congelar layout: columnas de Cliente 1..N desde el inicio
         if self.layout_clientes_fijo:
@@ -1111,56 +1555,187 @@ class SimulationWindow(tk.Toplevel):
         # Inserto fila de INICIALIZACION
         self._insert_initialization_row()
         # Ejecutar toda la simulación automáticamente si así se configuró
+        self._arranque = None  # after() que lanza la corrida automática
         if self.modo_auto:
             # Dejamos respirar a la UI y luego corremos todo
-            self.after(100, self.run_all_events)
+            self._arranque = self.after(100, self.run_all_events)
+
+
+    def _cargar_config(self, config_dict):
+        """Arma el motor para `config_dict` y deja en cero el estado de la corrida."""
+        self.engine = SimulationEngine(config_dict)
+        P = self.engine.P
+        self.modo_auto = P.modo_auto
+        self.layout_clientes_fijo = P.layout_clientes_fijo
+        self.max_clientes_fijos = P.max_clientes_fijos  # 20 = cap de personas en sala
+
+        # Ventana deslizante de visualización
+        self.i_limit = P.i_iteraciones
+        self._rows_shown = 0                 # filas de eventos ya insertadas (no cuenta INICIALIZACION)
+        self._final_row_cache = None         # (row, cli_snap) de la última fila de la simulación
+        self._inserted_final = False         # bandera para no duplicar la última fila
+
+    def _texto_resumen(self):
+        P = self.engine.P
+        return (
+            f"Config → X={P.time_limit} min | "
+            f"i={P.i_iteraciones} "
+            f"desde j={P.desde_j}  "
+            f"| t_entre_llegadas={P.t_inter} min"
+        )
+
+    def update_config(self, config_dict):
+        """
+        Reutiliza la ventana para otra config: corta la corrida anterior (si
+        había), arma un motor nuevo, vacía la tabla y vuelve a ocultar las
+        columnas de clientes. Las columnas del Treeview y los ítems del
+        header ya existen, así que no se reconfiguran.
+        """
+        # El hilo anterior termina solo; su cola queda descartada
+        if self._arranque is not None:
+            self.after_cancel(self._arranque)
+            self._arranque = None
+        self._stop.set()
+        self._stop = threading.Event()
+        self._cola_ui = queue.Queue()
+        self._corriendo = False
+        self._stats_actuales = None
+        if self.stats_win is not None and self.stats_win.winfo_exists():
+            self.stats_win.destroy()
+        self.stats_win = None
+
+        self._cargar_config(config_dict)
+        self._lbl_resumen.configure(text=self._texto_resumen())
+        if self.modo_auto:
+            self._btn_siguiente.pack_forget()
+        elif not self._btn_siguiente.winfo_manager():
+            self._btn_siguiente.pack(side="right")
+
+        # Volvemos a dejar solo las columnas base (con su ancho original las de clientes)
+        n_base = len(self._base_col_ids)
+        for cid, w in zip(self._col_ids[n_base:], self.CLIENTE_ANCHOS * len(self.known_clients)):
+            self.tree.column(cid, width=w)
+        del self._col_ids[n_base:]
+        del self._col_texts[n_base:]
+        del self._col_widths[n_base:]
+        del self.groups[self._n_grupos_base:]
+        self.known_clients.clear()
+        self._known_clients_set.clear()
+        self._invalidate_layout()
+
+        self.tree.delete(*self.tree.get_children())
+        self.tree.configure(displaycolumns=self._col_ids)
+        # Ya (no en after_idle): así se borran los ítems de los grupos de
+        # clientes, que se vuelven a crear con su título al aparecer
+        self._draw_group_headers()
+        if self.layout_clientes_fijo:
+            for cid in range(1, self.max_clientes_fijos + 1):
+                self._ensure_client_columns(cid)
 
+        self._insert_initialization_row()
+        if self.modo_auto:
+            self._arranque = self.after(100, self.run_all_events)
 
     # --- Helpers UI ---
     def open_stats(self):
+        # Mientras corre el hilo del motor se usan las últimas stats que mandó
+        stats = self._stats_actuales if self._corriendo else None
         if self.stats_win is None or not self.stats_win.winfo_exists():
-            self.stats_win = StatsWindow(self, self.engine)
+            self.stats_win = StatsWindow(self, self.engine, stats=stats)
         else:
             self.stats_win.lift()
-            self.stats_win.refresh(final=False)
+            self.stats_win.refresh(final=False, stats=stats)
 
-    def _refresh_stats_window(self, final=False):
+    def _refresh_stats_window(self, final=False, stats=None):
         if self.stats_win is not None and self.stats_win.winfo_exists():
-            self.stats_win.refresh(final=final)
+            self.stats_win.refresh(final=final, stats=stats)
 
-    def _apply_columns(self):
+    def _apply_columns(self, ids=None, texts=None, widths=None):
         """
-        Crea las headings del Treeview en base a self.columns actual.
+        Crea las headings del Treeview. Solo se configuran las columnas de
+        `ids` (por defecto, las visibles); el resto ya quedó configurado
+        cuando se crearon.
         """
-        col_ids = [c["id"] for c in self.columns]
-        self.tree["columns"] = col_ids
+        if ids is None:
+            ids, texts, widths = self._col_ids, self._col_texts, self._col_widths
+        self.tree["columns"] = self._base_col_ids + self._client_col_ids
+        self._invalidate_layout()
 
-        for c in self.columns:
-            self.tree.heading(c["id"], text=c["text"], anchor="center")
+        for cid, text, w in zip(ids, texts, widths):
+            self.tree.heading(cid, text=text, anchor="center")
             self.tree.column(
-                c["id"],
-                width=c["w"],
+                cid,
+                width=w,
                 minwidth=40,
                 anchor="center",
                 stretch=False
             )
 
+        # Solo se ven las columnas de self._col_ids (las de clientes aún no
+        # aparecidos quedan ocultas y sus celdas valen "")
+        self.tree.configure(displaycolumns=self._col_ids)
         self.header_canvas.configure(scrollregion=(0, 0, self._total_width(), 40))
 
+    def _client_col_ids_de(self, cid):
+        return [f"c{cid}_{campo}" for campo in self.CLIENTE_CAMPOS]
+
+    def _reservar_columnas_clientes(self, hasta_cid):
+        """
+        Crea de una vez (ocultas) las columnas de los clientes hasta `hasta_cid`.
+        Así, cuando aparece un cliente nuevo solo hay que mostrarlas, sin
+        reconfigurar todas las columnas existentes.
+        """
+        ids = []
+        for cid in range(self._client_slots + 1, hasta_cid + 1):
+            ids.extend(self._client_col_ids_de(cid))
+        n = hasta_cid - self._client_slots
+        self._client_slots = hasta_cid
+        self._client_col_ids.extend(ids)
+        self._apply_columns(ids, self.CLIENTE_TEXTOS * n, self.CLIENTE_ANCHOS * n)
+
+    def _pedir_group_headers(self):
+        """
+        Agenda un único redibujo del header de grupos para cuando la UI
+        quede ociosa (varios pedidos seguidos se juntan en uno).
+        """
+        if not self._headers_pendientes:
+            self._headers_pendientes = True
+            self.after_idle(self._redibujar_group_headers)
+
+    def _redibujar_group_headers(self):
+        self._headers_pendientes = False
+        self._draw_group_headers()
+
     def _total_width(self):
-        total = 0
-        for c in self.columns:
-            total += self.tree.column(c["id"], option="width")
-        return total
+        return sum(self._col_widths)
 
     def _col_x_positions(self):
-        xs = []
-        acc = 0
-        for c in self.columns:
-            w = self.tree.column(c["id"], option="width")
-            xs.append((acc, acc + w))
-            acc += w
-        return xs
+        """
+        Posiciones (x0, x1) de cada columna visible, a partir de los anchos
+        guardados. Se reutilizan hasta que cambian las columnas.
+        """
+        if self._xs is None:
+            xs = []
+            acc = 0
+            for w in self._col_widths:
+                xs.append((acc, acc + w))
+                acc += w
+            self._xs = xs
+        return self._xs
+
+    def _invalidate_layout(self):
+        """
+        Descarta el cache de posiciones de columnas. Llamarlo desde todo
+        lo que cambie anchos o columnas visibles.
+        """
+        self._xs = None
+
+    def _on_tree_release(self, event):
+        # Si el usuario cambió el ancho de una columna, recalculamos posiciones
+        if self.tree.identify_region(event.x, event.y) == "separator":
+            self._col_widths = [self.tree.column(c, option="width") for c in self._col_ids]
+            self._invalidate_layout()
+            self._pedir_group_headers()
 
     def _draw_group_headers(self):
         """
@@ -1171,8 +1746,12 @@ class SimulationWindow(tk.Toplevel):
           - al agregar columnas de un cliente nuevo
           - al final de cada on_next()
         para que SIEMPRE se vea el encabezado.
+
+        Los ítems del canvas se crean una sola vez y después solo se
+        reubican con coords(); únicamente los grupos/columnas nuevos
+        crean ítems.
         """
-        self.header_canvas.delete("all")
+        cv = self.header_canvas
         xs = self._col_x_positions()
         h = 40
 
@@ -1182,102 +1761,100 @@ class SimulationWindow(tk.Toplevel):
         group_separator_color = "#555555"
         group_boundaries = set()
 
+        visibles = []
         for text, i0, i1 in self.groups:
             if i0 >= len(xs) or i1 >= len(xs):
                 continue
-            x0 = xs[i0][0]
-            x1 = xs[i1][1]
-
-            # caja del grupo
-            self.header_canvas.create_rectangle(
-                x0, 0, x1, h,
-                fill=group_bg_color,
-                outline=group_border_color
-            )
-            # título del grupo
-            if text:
-                self.header_canvas.create_text(
-                    (x0 + x1) / 2, h / 2,
-                    text=text,
-                    anchor="center",
-                    font=("Segoe UI", 9, "bold"),
-                    fill="#000000"
+            visibles.append((text, xs[i0][0], xs[i1][1]))
+
+        items = self._group_items
+        for k, (text, x0, x1) in enumerate(visibles):
+            if k < len(items):
+                rect, txt, linea = items[k]
+                cv.coords(rect, x0, 0, x1, h)
+                if txt is not None:
+                    cv.coords(txt, (x0 + x1) / 2, h / 2)
+                cv.coords(linea, x0, h - 1, x1, h - 1)
+            else:
+                # caja del grupo
+                rect = cv.create_rectangle(
+                    x0, 0, x1, h,
+                    fill=group_bg_color,
+                    outline=group_border_color
                 )
-
-            # línea inferior del grupo
-            self.header_canvas.create_line(
-                x0, h - 1, x1, h - 1,
-                fill=group_separator_color,
-                width=1
-            )
+                # título del grupo
+                txt = None
+                if text:
+                    txt = cv.create_text(
+                        (x0 + x1) / 2, h / 2,
+                        text=text,
+                        anchor="center",
+                        font=("Segoe UI", 9, "bold"),
+                        fill="#000000"
+                    )
+                # línea inferior del grupo
+                linea = cv.create_line(
+                    x0, h - 1, x1, h - 1,
+                    fill=group_separator_color,
+                    width=1
+                )
+                items.append((rect, txt, linea))
             group_boundaries.add(x0)
             group_boundaries.add(x1)
 
+        for rect, txt, linea in items[len(visibles):]:
+            cv.delete(rect, linea)
+            if txt is not None:
+                cv.delete(txt)
+        del items[len(visibles):]
+
         # líneas finas por cada columna
-        for _, x1 in xs:
-            self.header_canvas.create_line(x1, 0, x1, h, fill=fine_line_color)
+        self._sync_lines(self._guide_items, [x1 for _, x1 in xs], h,
+                         tag="guia", fill=fine_line_color)
 
         # remarcar bordes de grupo
-        for x_boundary in sorted(list(group_boundaries)):
-            if x_boundary == 0:
-                continue
-            self.header_canvas.create_line(
-                x_boundary, 0, x_boundary, h,
-                fill=group_separator_color,
-                width=1
-            )
-
-        self.header_canvas.configure(scrollregion=(0, 0, self._total_width(), h))
+        self._sync_lines(self._boundary_items, [x for x in sorted(group_boundaries) if x != 0], h,
+                         tag="borde", fill=group_separator_color, width=1)
 
-    def _is_client_column(self, col_id: str) -> bool:
-            """
-            Devuelve True solo si la columna es del tipo dinámico de cliente:
-            ejemplo: c5_estado, c12_hora_llegada, etc.
-
-            Regla:
-            - empieza con 'c'
-            - después de la 'c' viene un número (id de cliente)
-            - luego un '_' y el nombre del campo
-            """
-            if not col_id.startswith("c"):
-                return False
+        # Las líneas siempre por encima de las cajas (aunque se hayan creado antes)
+        cv.tag_raise("guia")
+        cv.tag_raise("borde")
 
-            parts = col_id.split("_", 1)
-            if len(parts) != 2:
-                return False
+        cv.configure(scrollregion=(0, 0, self._total_width(), h))
 
-            prefix = parts[0]  # ej. 'c5' o 'c12'
-            if len(prefix) < 2:
-                return False
+    def _sync_lines(self, items, posiciones, h, tag, **opts):
+        """
+        Deja una línea vertical por cada x de `posiciones`, reutilizando
+        los ítems que ya existen en `items` y creando/borrando la diferencia.
+        """
+        cv = self.header_canvas
+        for k, x in enumerate(posiciones):
+            if k < len(items):
+                cv.coords(items[k], x, 0, x, h)
+            else:
+                items.append(cv.create_line(x, 0, x, h, tags=(tag,), **opts))
+        for item in items[len(posiciones):]:
+            cv.delete(item)
+        del items[len(posiciones):]
 
-            # lo que viene después de la 'c' tienen que ser dígitos
-            return prefix[1:].isdigit()
-    
     def _build_row_values(self, row, cli_snap):
-        values = []
-        for col_id in self.tree["columns"]:
-            if self._is_client_column(col_id):
-                try:
-                    prefix, campo = col_id.split("_", 1)
-                except ValueError:
-                    prefix, campo = col_id, ""
-                cid_str = prefix[1:] if prefix.startswith("c") else prefix
-                try:
-                    cid_int = int(cid_str)
-                except ValueError:
-                    cid_int = None
-
-                if cid_int is not None and cid_int in cli_snap:
-                    cli_info = cli_snap[cid_int]
-                    values.append(cli_info.get(campo, ""))
-                else:
-                    values.append("")
-            else:
-                if col_id == "iteracion":
-                    values.append(str(self.engine.iteration))
-                else:
-                    v = row.get(col_id, "")
-                    values.append("" if v == "" else str(v))
+        """
+        Arma los valores de una fila del Treeview:
+          - columnas base: la fila del motor tal cual viene (posicional),
+            formateando solo los números crudos
+          - columnas de clientes: 4 por cliente, en la posición de su id
+        """
+        values = [
+            ("" if v == "" else str(v)) if nd is None else fmt(v, nd)
+            for v, nd in zip(row, FORMATO_POR_COL)
+        ]
+
+        if cli_snap:
+            base = len(values)
+            values.extend([""] * (4 * max(cli_snap)))
+            for cid, info in cli_snap.items():
+                k = base + 4 * (cid - 1)
+                values[k:k + 4] = info
         return values
 
 
@@ -1291,7 +1868,6 @@ class SimulationWindow(tk.Toplevel):
             "reloj": fmt(eng.clock, 2),
             "lleg_tiempo": "",
             "lleg_minuto": fmt(eng.next_arrival, 2),
-            "lleg_id": "",
             "trx_rnd": "",
             "trx_tipo": "",
             "lee_rnd": "",
@@ -1316,50 +1892,53 @@ class SimulationWindow(tk.Toplevel):
             "est_cli_perm_acum": fmt(0),
         }
 
-        vals = []
-        for col_id in self.tree["columns"]:
-            if self._is_client_column(col_id):
-                # columnas dinámicas de "Cliente N"
-                vals.append("")
-            elif col_id == "iteracion":
-                vals.append("0")
-            else:
-                vals.append(str(base.get(col_id, "")))
+        # Solo columnas base: las de clientes quedan vacías
+        vals = [str(base[col_id]) for col_id in COL_NAMES]
         self.tree.insert("", "end", values=vals, tags=('evenrow',))
 
     def _ensure_client_columns(self, cid: int):
         """
         Si aparece un cliente nuevo (por ejemplo Cliente 5),
-        agregamos al final 4 columnas:
+        mostramos al final sus 4 columnas:
           c5_estado, c5_hora_llegada, c5_a_que_fue, c5_cuando_termina
         y creamos un grupo "Cliente 5" para el header gráfico.
+        Las columnas ya están reservadas (ocultas), así que no se
+        reconfiguran las demás ni se tocan las filas ya insertadas.
         """
-        if cid in self.known_clients:
+        if cid in self._known_clients_set:
             return  # El cliente ya existe, no hacemos nada
 
-        # 1. Actualizar la definición de columnas en memoria
-        self.known_clients.append(cid)
-        start_idx = len(self.columns)
+        # 0. Si se acabaron las columnas reservadas, reservamos otro bloque
+        if cid > self._client_slots:
+            self._reservar_columnas_clientes(max(cid, self._client_slots + self.SLOTS_CLIENTES))
 
-        new_cols = [
-            {"id": f"c{cid}_estado", "text": "ESTADO", "w": 110},
-            {"id": f"c{cid}_hora_llegada", "text": "HORA_LLEGADA", "w": 130},
-            {"id": f"c{cid}_a_que_fue", "text": "A QUE FUE", "w": 120},
-            {"id": f"c{cid}_cuando_termina", "text": "Cuando termina de leer", "w": 180},
-        ]
-
-        self.columns.extend(new_cols)
-        end_idx = len(self.columns) - 1
+        # 1. Actualizar la definición de columnas visibles en memoria
+        self.known_clients.append(cid)
+        self._known_clients_set.add(cid)
+        # Cada cliente visible ocupa un bloque fijo después de las columnas base
+        ancho = len(self.CLIENTE_CAMPOS)
+        start_idx = len(self._base_col_ids) + ancho * (len(self.known_clients) - 1)
+        end_idx = start_idx + ancho - 1
+
+        self._col_ids.extend(self._client_col_ids_de(cid))
+        self._col_texts.extend(self.CLIENTE_TEXTOS)
+        self._col_widths.extend(self.CLIENTE_ANCHOS)
+
+        # Extendemos el cache de posiciones con los anchos ya conocidos
+        if self._xs is not None:
+            acc = self._xs[-1][1] if self._xs else 0
+            for w in self.CLIENTE_ANCHOS:
+                self._xs.append((acc, acc + w))
+                acc += w
 
         # 2. Registramos este bloque como nuevo grupo visual "Cliente X"
         self.groups.append((f"Cliente {cid}", start_idx, end_idx))
 
-        # 3. Re-aplicamos TODAS las columnas (viejas + nuevas) al Treeview
-        #    Esto leerá de self.columns y configurará todo de nuevo.
-        self._apply_columns()
+        # 3. Mostramos las columnas nuevas (una sola llamada al Treeview)
+        self.tree.configure(displaycolumns=self._col_ids)
 
-        # 4. Redibujamos el header de grupos (que _apply_columns no hace)
-        self._draw_group_headers()
+        # 4. El header de grupos se redibuja cuando la UI quede libre
+        self._pedir_group_headers()
 
     def on_next(self):
         """
@@ -1377,18 +1956,19 @@ class SimulationWindow(tk.Toplevel):
                 values = self._build_row_values(row_f, snap_f)
                 tag = 'evenrow' if self.engine.iteration % 2 == 0 else 'oddrow'
                 self.tree.insert("", "end", values=values, tags=(tag,))
-                self._draw_group_headers()
+                self._pedir_group_headers()
                 self._inserted_final = True
 
             self.open_stats()
             self._refresh_stats_window(final=True)
+            from tkinter import messagebox
             messagebox.showinfo(
     "Fin de simulación",
     "No hay más eventos (tiempo límite alcanzado o no hay pendientes)."
 )
 
 
-            self._draw_group_headers()
+            self._pedir_group_headers()
             return
 
         try:
@@ -1403,13 +1983,14 @@ class SimulationWindow(tk.Toplevel):
                 values = self._build_row_values(row_f, snap_f)
                 tag = 'evenrow' if self.engine.iteration % 2 == 0 else 'oddrow'
                 self.tree.insert("", "end", values=values, tags=(tag,))
-                self._draw_group_headers()
+                self._pedir_group_headers()
                 self._inserted_final = True
 
             self.open_stats()
             self._refresh_stats_window(final=True)
+            from tkinter import messagebox
             messagebox.showinfo("Fin de simulación", str(e))
-            self._draw_group_headers()
+            self._pedir_group_headers()
             return
 
         # Mostrar o cachear según ventana de i filas
@@ -1421,7 +2002,7 @@ class SimulationWindow(tk.Toplevel):
             tag = 'evenrow' if self.engine.iteration % 2 == 0 else 'oddrow'
             self.tree.insert("", "end", values=values, tags=(tag,))
             self._rows_shown += 1
-            self._draw_group_headers()
+            self._pedir_group_headers()
         else:
             self._final_row_cache = (row, cli_snap)
 
@@ -1500,11 +2081,15 @@ class App(tk.Tk):
         # El resto del código no necesita cambios, ya que usa 'root'
 
         self.fields = {}
+        # Un solo validatecommand registrado en Tcl, compartido por todos los campos
+        self._vcmd = (self.register(_only_digits), "%P")
+        # after() pendiente por callback "debounced" (ver _debounce)
+        self._pendientes = {}
+        # Última suma mostrada en lbl_sum (arranca en "0%")
+        self._ultima_suma = 0
 
         # --- 1) Simulación ---
-        sim = ttk.LabelFrame(root, text="1) Simulación (todo en minutos)")
-        sim.grid(row=0, column=0, sticky="ew", pady=(0, 8))
-        sim.columnconfigure(1, weight=1)
+        sim = self._make_section(root, 0, "1) Simulación (todo en minutos)")
         self._mk_int(
             sim, "tiempo_limite", "Tiempo límite X", 60, 1, 10_000_000,
             "La simulación termina al llegar a X o a N iteraciones (lo que ocurra primero)."
@@ -1523,53 +2108,45 @@ class App(tk.Tk):
             sim,
             text="Ejecutar automáticamente (sin 'Siguiente evento')",
             variable=self.auto_var
-        ).grid(row=4, column=0, columnspan=3, sticky="w", pady=(4, 0))
+        ).grid(row=self._siguiente_fila(sim), column=0, columnspan=3, sticky="w", pady=(4, 0))
 
 
         # --- 2) Llegadas ---
-        lleg = ttk.LabelFrame(root, text="2) Llegadas")
-        lleg.grid(row=1, column=0, sticky="ew", pady=(0, 8))
-        lleg.columnconfigure(1, weight=1)
+        lleg = self._make_section(root, 1, "2) Llegadas")
         self._mk_int(
             lleg, "t_entre_llegadas", "Tiempo entre llegadas (min)", 4, 1, 10_000,
             "Entero en minutos (por defecto 4)."
         )
 
         # --- 3) Motivos ---
-        motivos = ttk.LabelFrame(root, text="3) Motivos de llegada (%) — Debe sumar 100%")
-        motivos.grid(row=2, column=0, sticky="ew", pady=(0, 8))
-        motivos.columnconfigure(1, weight=1)
+        motivos = self._make_section(root, 2, "3) Motivos de llegada (%) — Debe sumar 100%")
 
-        self._mk_int(motivos, "pct_pedir", "Pedir libros (%)", 45, 0, 100, on_change=self._update_pct_sum)
-        self._mk_int(motivos, "pct_devolver", "Devolver libros (%)", 45, 0, 100, on_change=self._update_pct_sum)
-        self._mk_int(motivos, "pct_consultar", "Consultar hacerse socio (%)", 10, 0, 100, on_change=self._update_pct_sum)
+        self._mk_int(motivos, "pct_pedir", "Pedir libros (%)", 45, 0, 100, on_change=self._programar_pct_sum)
+        self._mk_int(motivos, "pct_devolver", "Devolver libros (%)", 45, 0, 100, on_change=self._programar_pct_sum)
+        self._mk_int(motivos, "pct_consultar", "Consultar hacerse socio (%)", 10, 0, 100, on_change=self._programar_pct_sum)
 
         sumrow = ttk.Frame(motivos)
-        sumrow.grid(row=3, column=0, columnspan=3, sticky="w", pady=(4, 0))
+        sumrow.grid(row=self._siguiente_fila(motivos), column=0, columnspan=3, sticky="w", pady=(4, 0))
         ttk.Label(sumrow, text="Suma actual:").pack(side="left")
         self.lbl_sum = ttk.Label(sumrow, text="0%", style="Bad.TLabel")
         self.lbl_sum.pack(side="left", padx=6)
 
         # --- 4) Consultas (Uniforme A,B) ---
-        cons = ttk.LabelFrame(root, text="4) Consultas — Distribución Uniforme(A, B) en minutos")
-        cons.grid(row=3, column=0, sticky="ew", pady=(0, 8))
-        cons.columnconfigure(1, weight=1)
+        cons = self._make_section(root, 3, "4) Consultas — Distribución Uniforme(A, B) en minutos")
 
         self._mk_int(cons, "uni_a", "A (min)", 2, 0, 10_000, "Debe cumplirse A < B y A ≠ B.")
         self._mk_int(cons, "uni_b", "B (min)", 5, 0, 10_000)
 
         # --- 5) Lectura ---
-        lect = ttk.LabelFrame(root, text="5) Lectura")
-        lect.grid(row=4, column=0, sticky="ew", pady=(0, 8))
-        lect.columnconfigure(1, weight=1)
+        lect = self._make_section(root, 4, "5) Lectura")
 
         self._mk_int(
             lect, "pct_retira", "Se retira a leer en casa (%)", 60, 0, 100,
-            on_change=self._update_queda
+            on_change=self._programar_queda
         )
 
         fila_queda = ttk.Frame(lect)
-        fila_queda.grid(row=1, column=0, columnspan=3, sticky="w", pady=(2, 0))
+        fila_queda.grid(row=self._siguiente_fila(lect), column=0, columnspan=3, sticky="w", pady=(2, 0))
         ttk.Label(fila_queda, text="Se queda a leer en biblioteca (%)").pack(side="left")
         self.lbl_queda = ttk.Label(fila_queda, text="40")
         self.lbl_queda.pack(side="left", padx=8)
@@ -1586,6 +2163,9 @@ class App(tk.Tk):
         salida.columnconfigure(0, weight=1)
 
         self.txt_out = tk.Text(salida, height=10)
+        self._ultimo_json = None  # lo que hay ahora en txt_out (None = otra cosa)
+        self._ultimo_clipboard = None  # lo último que copiamos al portapapeles
+        self._sim_window = None        # se reutiliza entre clicks de "Generar"
         self.txt_out.grid(row=0, column=0, sticky="nsew")
         salida.rowconfigure(0, weight=1)
 
@@ -1602,30 +2182,46 @@ class App(tk.Tk):
         self._update_queda()
 
     # ---- helpers de UI principal ----
+    def _siguiente_fila(self, parent):
+        """
+        Próxima fila libre de la grilla de `parent` (contador guardado en el
+        propio widget, sin recorrer sus hijos).
+        """
+        r = getattr(parent, "_next_row", 0)
+        parent._next_row = r + 1
+        return r
+
+    def _make_section(self, parent, row, text):
+        """Crea una sección (LabelFrame) del formulario en la fila `row`."""
+        frame = ttk.LabelFrame(parent, text=text)
+        frame.grid(row=row, column=0, sticky="ew", pady=(0, 8))
+        frame.columnconfigure(1, weight=1)
+        return frame
+
     def _mk_int(self, parent, key, label, default, lo, hi, help_=None, on_change=None):
         row = ttk.Frame(parent)
 
-        r = max(
-            (child.grid_info().get("row", -1) for child in parent.winfo_children() if isinstance(child, ttk.Frame)),
-            default=-1,
-        ) + 1
+        r = self._siguiente_fila(parent)
 
         row.grid(row=r, column=0, columnspan=3, sticky="ew", pady=3)
         row.columnconfigure(1, weight=1)
 
         ttk.Label(row, text=label, width=34, anchor="w").grid(row=0, column=0, sticky="w")
-        var = tk.StringVar(value=str(default))
-        ent = ttk.Entry(row, textvariable=var, width=14)
+        # Solo los campos con feedback en vivo llevan StringVar (y su trace);
+        # el resto es un Entry pelado que se lee con .get() al generar
+        if on_change:
+            var = tk.StringVar(value=str(default))
+            ent = ttk.Entry(row, textvariable=var, width=14)
+        else:
+            var = None
+            ent = ttk.Entry(row, width=14)
+            ent.insert(0, str(default))
         ent.grid(row=0, column=1, sticky="w", padx=(0, 8))
 
         if help_:
             ttk.Label(row, text=help_, foreground="#6b7280").grid(row=0, column=2, sticky="w")
 
-        def only_digits(P):
-            return (P == "") or P.isdigit()
-
-        vcmd = (self.register(only_digits), "%P")
-        ent.configure(validate="key", validatecommand=vcmd)
+        ent.configure(validate="key", validatecommand=self._vcmd)
 
         self.fields[key] = {
             "var": var,
@@ -1633,28 +2229,60 @@ class App(tk.Tk):
             "lo": lo,
             "hi": hi,
             "default": default,
+            "style": "TEntry",  # estilo actual del Entry, para no repetirlo en Tcl
         }
 
         if on_change:
-            var.trace_add("write", lambda *args: on_change())
+            # on_change recibe directo los 3 args del trace (name, index, op)
+            var.trace_add("write", on_change)
 
         return ent
 
+    @staticmethod
+    def _set_style(meta, style):
+        """Cambia el estilo del Entry de un campo solo si es distinto al actual."""
+        if meta["style"] != style:
+            meta["entry"].configure(style=style)
+            meta["style"] = style
+
+    # Cuánto se espera (ms) después de la última tecla para recalcular
+    DEBOUNCE_MS = 40
+    # Campos cuya suma tiene que dar 100
+    PCT_MOTIVOS = ("pct_pedir", "pct_devolver", "pct_consultar")
+
+    def _debounce(self, fn):
+        """
+        Agenda fn para dentro de DEBOUNCE_MS, cancelando la que estaba
+        pendiente: una ráfaga de teclas termina en una sola llamada.
+        """
+        pendiente = self._pendientes.get(fn)
+        if pendiente is not None:
+            self.after_cancel(pendiente)
+        self._pendientes[fn] = self.after(self.DEBOUNCE_MS, self._correr_pendiente, fn)
+
+    def _correr_pendiente(self, fn):
+        self._pendientes.pop(fn, None)
+        fn()
+
+    def _programar_pct_sum(self, *_):
+        self._debounce(self._update_pct_sum)
+
+    def _programar_queda(self, *_):
+        self._debounce(self._update_queda)
+
     def _update_pct_sum(self):
-        s = 0
-        for k in ("pct_pedir", "pct_devolver", "pct_consultar"):
-            v = int_or_none(self.fields[k]["var"].get())
-            s += v if v is not None else 0
-
-        self.lbl_sum.configure(text=f"{s}%")
-        if s == 100:
-            self.lbl_sum.configure(style="Ok.TLabel")
-        else:
-            self.lbl_sum.configure(style="Bad.TLabel")
+        fields = self.fields
+        s = sum(_digits_to_int(fields[k]["entry"].get()) for k in self.PCT_MOTIVOS)
+        if s == self._ultima_suma:
+            return
+        self._ultima_suma = s
+
+        self.lbl_sum.configure(
+            text=f"{s}%", style="Ok.TLabel" if s == 100 else "Bad.TLabel"
+        )
 
     def _update_queda(self):
-        p = int_or_none(self.fields["pct_retira"]["var"].get())
-        p = 0 if p is None else p
+        p = _digits_to_int(self.fields["pct_retira"]["entry"].get())
         queda = max(0, min(100, 100 - p))
         self.lbl_queda.configure(text=str(queda))
 
@@ -1698,104 +2326,105 @@ class App(tk.Tk):
         }
 
         for k, meta in self.fields.items():
-            meta["entry"].configure(style="TEntry")
+            self._set_style(meta, "TEntry")
         for k, v in defaults.items():
-            self.fields[k]["var"].set(str(v))
+            meta = self.fields[k]
+            if meta["var"] is not None:
+                meta["var"].set(str(v))
+            else:
+                meta["entry"].delete(0, "end")
+                meta["entry"].insert(0, str(v))
 
         self.txt_out.delete("1.0", "end")
+        self._ultimo_json = None
+
+    def _clipboard_tiene(self, texto):
+        """
+        True si el portapapeles sigue siendo nuestro y tiene `texto`.
+        Preguntar si somos dueños no sale de Tk; si otra app copió algo,
+        perdimos la selección y hay que volver a copiar.
+        """
+        if texto != self._ultimo_clipboard:
+            return False
+        try:
+            return bool(self.selection_own_get(selection="CLIPBOARD"))
+        except tk.TclError:
+            return False
 
     def on_generate(self):
         # limpiamos estilos rojos
         for meta in self.fields.values():
-            meta["entry"].configure(style="TEntry")
+            self._set_style(meta, "TEntry")
 
         errors = []
-        mark = []
+        mark = set()
 
-        def need_int(key, desc, lo, hi):
-            val = int_or_none(self.fields[key]["var"].get())
+        # Rango de cada campo (tabla FIELD_SPECS); después, los chequeos cruzados
+        fields = self.fields
+        vals = {}
+        for key, desc, lo, hi in FIELD_SPECS:
+            val = int_or_none(fields[key]["entry"].get())
             if not between(val, lo, hi):
                 errors.append(f"• {desc}: debe ser entero en [{lo}, {hi}]")
-                mark.append(key)
-            return val
+                mark.add(key)
+            vals[key] = val
 
-        t_lim = need_int("tiempo_limite", "Tiempo límite X", 1, 10_000_000)
-        i_mos = need_int("i_mostrar", "i (iteraciones a mostrar)", 1, 100_000)
-        j_ini = need_int("j_inicio", "j (minuto de inicio)", 0, 10_000_000)
+        t_lim, i_mos, j_ini = vals["tiempo_limite"], vals["i_mostrar"], vals["j_inicio"]
+        t_lleg = vals["t_entre_llegadas"]
+        p_ped, p_dev, p_con = vals["pct_pedir"], vals["pct_devolver"], vals["pct_consultar"]
+        a, b = vals["uni_a"], vals["uni_b"]
+        p_ret, t_bib = vals["pct_retira"], vals["t_lectura_biblio"]
 
         if None not in (t_lim, j_ini) and j_ini >= t_lim:
             errors.append("• j debe ser menor que X.")
-            mark += ["j_inicio", "tiempo_limite"]
-
-        t_lleg = need_int("t_entre_llegadas", "Tiempo entre llegadas (min)", 1, 10_000)
-
-        p_ped = need_int("pct_pedir", "Pedir libros (%)", 0, 100)
-        p_dev = need_int("pct_devolver", "Devolver libros (%)", 0, 100)
-        p_con = need_int("pct_consultar", "Consultar hacerse socio (%)", 0, 100)
+            mark.update(("j_inicio", "tiempo_limite"))
 
         if None not in (p_ped, p_dev, p_con):
             if p_ped + p_dev + p_con != 100:
                 errors.append(f"• La suma de motivos debe ser 100% (ahora {p_ped+p_dev+p_con}%).")
-                mark += ["pct_pedir", "pct_devolver", "pct_consultar"]
-
-        a = need_int("uni_a", "Uniforme A (min)", 0, 10_000)
-        b = need_int("uni_b", "Uniforme B (min)", 0, 10_000)
+                mark.update(("pct_pedir", "pct_devolver", "pct_consultar"))
 
         if None not in (a, b):
             if a == b:
                 errors.append("• En Uniforme(A,B) debe cumplirse A ≠ B.")
-                mark += ["uni_a", "uni_b"]
+                mark.update(("uni_a", "uni_b"))
             if a > b:
                 errors.append("• En Uniforme(A,B) debe cumplirse A < B.")
-                mark += ["uni_a", "uni_b"]
-
-        p_ret = need_int("pct_retira", "Se retira a leer en casa (%)", 0, 100)
-        t_bib = need_int("t_lectura_biblio", "Tiempo fijo en biblioteca (min)", 1, 10_000)
+                mark.update(("uni_a", "uni_b"))
 
         if errors:
-            for k in set(mark):
-                self.fields[k]["entry"].configure(style="Invalid.TEntry")
+            for k in mark:
+                self._set_style(self.fields[k], "Invalid.TEntry")
+            from tkinter import messagebox  # solo hace falta si hay errores
             messagebox.showerror("Validación", "Revisá:\n\n" + "\n".join(errors))
             return
 
         # Armamos el dict final de configuración
-        cfg = {
-            "simulacion": {
-                "tiempo_limite_min": t_lim,
-                "mostrar_vector_estado": {
-                    "i_iteraciones": i_mos,
-                    "desde_minuto_j": j_ini
-                },
-                "modo_auto": bool(self.auto_var.get())
-            },
-            "llegadas": {
-                "tiempo_entre_llegadas_min": t_lleg
-            },
-            "motivos": {
-                "pedir_libros_pct": p_ped,
-                "devolver_libros_pct": p_dev,
-                "consultar_socios_pct": p_con
-            },
-            "consultas_uniforme": {
-                "a_min": a,
-                "b_min": b
-            },
-            "lectura": {
-                "retira_casa_pct": p_ret,
-                "queda_biblioteca_pct": 100 - p_ret,
-                "tiempo_fijo_biblioteca_min": t_bib
-            }
-        }
+        key = (t_lim, i_mos, j_ini, bool(self.auto_var.get()),
+               t_lleg, p_ped, p_dev, p_con, a, b, p_ret, t_bib)
+        cfg = _armar_cfg(key)
 
         # Mostrar config en el textbox y copiar al portapapeles
-        self.txt_out.delete("1.0", "end")
-        pretty = json.dumps(cfg, indent=2, ensure_ascii=False)
-        self.txt_out.insert("1.0", pretty)
-        self.clipboard_clear()
-        self.clipboard_append(pretty)
-
-        # Abrir la ventana de simulación con esta config
-        SimulationWindow(self, cfg)
+        # (si es la misma que ya está y nadie la editó, no se reescribe)
+        pretty = _dump_cfg(key)
+        if pretty != self._ultimo_json or self.txt_out.edit_modified():
+            self.txt_out.delete("1.0", "end")
+            self.txt_out.insert("1.0", pretty)
+            self.txt_out.edit_modified(False)
+            self._ultimo_json = pretty
+        if not self._clipboard_tiene(pretty):
+            self.clipboard_clear()
+            self.clipboard_append(pretty)
+            self._ultimo_clipboard = pretty
+
+        # Abrir la ventana de simulación con esta config (o reutilizar la abierta)
+        win = self._sim_window
+        if win is None or not win.winfo_exists():
+            self._sim_window = SimulationWindow(self, cfg)
+        else:
+            win.update_config(cfg)
+            win.deiconify()
+            win.lift()
 
 
 if __name__ == "__main__":
@@ -1,16 +1,22 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import json
+from tkinter import ttk, messagebox, font as tkfont
+import functools
 import random
 import math
-from collections import deque
+import heapq
+import bisect
+import itertools
+from collections import deque, OrderedDict
+from types import MappingProxyType
 import sqlite3
 import tempfile
 import os
+import time
 
 APP_TITLE = "Parámetros de Simulación - Biblioteca (Tabla virtualizada / RAM estable)"
 GROUP_BG = "#e8efff"
 GROUP_BORDER = "#a8b3d7"
+CELL_BORDER = "#d1d5db"
 MAX_CAPACITY = 20  # Máximo total de personas dentro (2 bibliotecarios + hasta 18 clientes)
 
 
@@ -22,6 +28,23 @@ def int_or_none(s: str):
         return None
 
 
+# Rango válido de cada campo entero del formulario: (key, descripción, lo, hi)
+FIELD_SPECS = (
+    ("tiempo_limite", "Tiempo límite X", 1, 10_000),
+    ("iteraciones_max", "Cantidad de iteraciones N", 1, 100_000),
+    ("i_mostrar", "i (iteraciones a mostrar)", 1, 100_000),
+    ("j_inicio", "j (minuto de inicio)", 0, 10_000),
+    ("t_entre_llegadas", "Tiempo entre llegadas (min)", 1, 10_000),
+    ("pct_pedir", "Pedir libros (%)", 0, 100),
+    ("pct_devolver", "Devolver libros (%)", 0, 100),
+    ("pct_consultar", "Consultar hacerse socio (%)", 0, 100),
+    ("uni_a", "Uniforme A (min)", 0, 10_000),
+    ("uni_b", "Uniforme B (min)", 0, 10_000),
+    ("pct_retira", "Se retira a leer en casa (%)", 0, 100),
+    ("t_lectura_biblio", "Tiempo fijo en biblioteca (min)", 1, 10_000),
+)
+
+
 def between(value, lo=None, hi=None):
     if value is None:
         return False
@@ -38,8 +61,103 @@ def fmt(x, nd=2):
     return f"{x:.{nd}f}"
 
 
+# Formatos pre-armados para las filas del motor (se llaman varias veces por evento)
+_F2 = "{:.2f}".format
+_F4 = "{:.4f}".format
+
+
+def fmt2(x):
+    return "" if x is None or x == "" else _F2(x)
+
+
+def fmt4(x):
+    return "" if x is None or x == "" else _F4(x)
+
+
+@functools.lru_cache(maxsize=32)
+def validar_campos(textos):
+    """
+    Valida los textos del formulario (uno por campo, en el orden de FIELD_SPECS).
+    Devuelve (errores, campos a marcar, valores por key). Está memoizada:
+    apretar "Generar" otra vez sin tocar nada no vuelve a validar.
+    """
+    errors = []
+    mark = set()
+    ion = int_or_none
+    btw = between
+
+    # Rango de cada campo (tabla FIELD_SPECS); después, los chequeos cruzados
+    vals = {}
+    for (key, desc, lo, hi), texto in zip(FIELD_SPECS, textos):
+        val = ion(texto)
+        if not btw(val, lo, hi):
+            errors.append(f"{desc}: debe ser entero en [{lo}, {hi}]")
+            mark.add(key)
+        vals[key] = val
+
+    t_lim, n_max = vals["tiempo_limite"], vals["iteraciones_max"]
+    i_mos, j_ini = vals["i_mostrar"], vals["j_inicio"]
+    p_ped, p_dev, p_con = vals["pct_pedir"], vals["pct_devolver"], vals["pct_consultar"]
+    a, b = vals["uni_a"], vals["uni_b"]
+
+    if None not in (t_lim, j_ini) and j_ini >= t_lim:
+        errors.append("j debe ser menor que X.")
+        mark.update(("j_inicio", "tiempo_limite"))
+
+    if None not in (i_mos, n_max) and i_mos > n_max:
+        errors.append("i no debería exceder N.")
+        mark.update(("i_mostrar", "iteraciones_max"))
+
+    if None not in (p_ped, p_dev, p_con):
+        if p_ped + p_dev + p_con != 100:
+            errors.append(f"La suma de motivos debe ser 100% (ahora {p_ped+p_dev+p_con}%).")
+            mark.update(("pct_pedir", "pct_devolver", "pct_consultar"))
+
+    if None not in (a, b):
+        if a == b:
+            errors.append("En Uniforme(A,B) debe cumplirse A ≠ B.")
+            mark.update(("uni_a", "uni_b"))
+        if a > b:
+            errors.append("En Uniforme(A,B) debe cumplirse A < B.")
+            mark.update(("uni_a", "uni_b"))
+
+    # El resultado queda en el cache de lru_cache: se devuelve todo inmutable
+    return tuple(errors), frozenset(mark), MappingProxyType(vals)
+
+
+@functools.lru_cache(maxsize=32)
+def _format_errors(errors):
+    return "Revisá:\n\n" + "\n".join("• " + e for e in errors)
+
+
+# Volcado de la config a texto; se resuelve en la primera llamada (ver config_a_json)
+_config_dumps = None
+
+
+def config_a_json(cfg):
+    """
+    Texto JSON de la config, con indent=2. Usa orjson si está instalado y si
+    no json.dumps; el import se hace en la primera llamada, no al abrir la app.
+    """
+    global _config_dumps
+    if _config_dumps is None:
+        try:
+            import orjson
+            _config_dumps = lambda c: orjson.dumps(c, option=orjson.OPT_INDENT_2).decode()
+        except ImportError:
+            import json
+            _config_dumps = lambda c: json.dumps(c, indent=2, ensure_ascii=False)
+    return _config_dumps(cfg)
+
+
 # ----------------- Modelos -----------------
 class Cliente:
+    # Atributos fijos: sin __dict__ por instancia (puede haber miles de clientes)
+    __slots__ = (
+        "id", "estado", "hora_llegada", "hora_llegada_str", "hora_entrada_cola",
+        "a_que_fue_inicial", "accion_actual", "fin_lect_num", "cuando_termina_leer",
+    )
+
     def __init__(self, cid, hora_llegada):
         self.id = cid
         # estados posibles: "EN COLA", "SIENDO ATENDIDO(1)", "SIENDO ATENDIDO(2)",
@@ -48,6 +166,7 @@ class Cliente:
 
         # Tiempos clave
         self.hora_llegada = hora_llegada      # float (para permanencia total en el sistema)
+        self.hora_llegada_str = fmt2(hora_llegada)  # lo que se muestra (no cambia)
         self.hora_entrada_cola = hora_llegada # cuando entra/reingresa a cola
 
         # Motivo / acción
@@ -60,14 +179,20 @@ class Cliente:
 
 
 class Bibliotecario:
+    __slots__ = ("ocupado", "rnd", "demora", "hora", "hora_num", "cliente_id")
+
     def __init__(self):
-        self.estado = "LIBRE"   # "LIBRE" / "OCUPADO"
+        self.ocupado = False     # el motor mira esto; "estado" es solo para mostrar
         self.rnd = ""           # RND del servicio actual
         self.demora = ""        # demora servicio actual
         self.hora = ""          # fin de servicio estimado (string)
         self.hora_num = None    # fin de servicio estimado (float)
         self.cliente_id = None  # ID del cliente al que atiende
 
+    @property
+    def estado(self):
+        return "OCUPADO" if self.ocupado else "LIBRE"
+
 
 # ----------------- Motor de simulación -----------------
 class SimulationEngine:
@@ -94,9 +219,12 @@ class SimulationEngine:
         self.p_pedir = cfg["motivos"]["pedir_libros_pct"] / 100.0
         self.p_devolver = cfg["motivos"]["devolver_libros_pct"] / 100.0
         self.p_consultar = cfg["motivos"]["consultar_socios_pct"] / 100.0
+        # Umbrales acumulados para el sorteo de transacción (ver _elige_transaccion)
+        self._trx_cum = (self.p_pedir, self.p_pedir + self.p_devolver)
 
         self.uni_a = cfg["consultas_uniforme"]["a_min"]
         self.uni_b = cfg["consultas_uniforme"]["b_min"]
+        self._uni_rango = self.uni_b - self.uni_a
 
         self.p_retira = cfg["lectura"]["retira_casa_pct"] / 100.0
         self.t_lect_biblio = cfg["lectura"]["tiempo_fijo_biblioteca_min"]
@@ -112,16 +240,43 @@ class SimulationEngine:
         self.iteration = 0
         self.next_client_id = 1
 
+        # Agenda de eventos futuros (heap). Cada entrada es
+        # (t, prioridad, id, generacion, tipo); _gen guarda la generación vigente
+        # de cada (tipo, id) para descartar entradas viejas de forma perezosa.
+        self._events = []
+        self._gen = {}
+        self._gen_seq = 0  # generaciones únicas, nunca se reutilizan
+        self._schedule("llegada", 0, self.next_arrival)
+
+        # Generador propio. Con cfg["simulacion"]["seed"] la corrida es
+        # reproducible; sin semilla (None) cada corrida es distinta.
+        # No se puede re-sembrar a mitad de corrida: _rand ya tiene un
+        # bloque de números generado con la semilla anterior.
+        self.seed = cfg["simulacion"].get("seed")
+        self._rng = random.Random(self.seed)
+
+        # Números aleatorios pre-generados por bloques (ver _rand)
+        self._rbuf = []
+        self._ri = 0
+
         # Estado de clientes
         self.cola = deque()            # cola FIFO de IDs de cliente
         self.clientes = {}             # id -> Cliente (activos / recién destruidos)
-        self._to_clear_after_emit = set()  # IDs para borrar antes del siguiente evento
+        self._cli_snap = {}            # id -> columnas Cliente N (ver build_client_snapshot)
+        # ID del cliente a borrar antes del siguiente evento (cada evento
+        # destruye a lo sumo un cliente), o None
+        self._pending_destroy = None
 
         # Bibliotecarios
-        self.bib = [Bibliotecario(), Bibliotecario()]
-
-        # Personas leyendo físicamente en sala
-        self.biblio_personas_cnt = 0
+        # Son siempre dos: cada uno tiene su atributo y el código los trata
+        # por separado; la tupla queda para cuando se elige por índice
+        self.b1 = Bibliotecario()
+        self.b2 = Bibliotecario()
+        self.bib = (self.b1, self.b2)
+
+        # Clientes presentes (cola + atención + leyendo), se lleva al día en
+        # cada evento en lugar de recontarlo
+        self._occupancy = 0
         self.biblio_estado = ""
         self._update_biblio_estado()
 
@@ -147,25 +302,59 @@ class SimulationEngine:
         self._finalizado = False
 
     # ---------- helpers internos ----------
+    _TRX_NOMBRES = ("Pedir", "Devolver", "Consultar")
+
+    # Prioridad para desempatar eventos simultáneos (ver _proximo_evento)
+    _PRIORIDAD_EVENTO = {"fin_atencion": 0, "fin_lectura": 3, "llegada": 4}
+
+    def _schedule(self, tipo, ident, t):
+        """
+        Agenda (o reprograma) el evento (tipo, ident) para el tiempo t.
+        Si ya había uno agendado para el mismo (tipo, ident), queda invalidado.
+        """
+        self._gen_seq += 1
+        gen = self._gen_seq
+        self._gen[(tipo, ident)] = gen
+        # FIN_ATENCION_i desempata por i (1 ó 2); el resto por su prioridad fija + id
+        prio = self._PRIORIDAD_EVENTO[tipo] + (ident if tipo == "fin_atencion" else 0)
+        heapq.heappush(self._events, (t, prio, ident, gen, tipo))
+
+    # Cantidad de números aleatorios que se generan de una vez
+    RND_BLOQUE = 4096
+
+    def _rand(self):
+        """
+        Devuelve el siguiente RND en [0,1) del bloque pre-generado.
+        Cuando el bloque se agota se genera otro entero de una sola vez,
+        respetando el mismo orden de la secuencia de self._rng.random().
+        """
+        i = self._ri
+        if i >= len(self._rbuf):
+            rnd = self._rng.random
+            self._rbuf = [rnd() for _ in range(self.RND_BLOQUE)]
+            i = 0
+        self._ri = i + 1
+        return self._rbuf[i]
+
     def _clear_destroyed_clients(self):
         """
         Borra definitivamente los clientes marcados como destruidos en la iteración anterior,
         para que dejen de mostrarse en las columnas Cliente N en las filas siguientes.
         """
-        if not self._to_clear_after_emit:
+        cid = self._pending_destroy
+        if cid is None:
             return
-        for cid in list(self._to_clear_after_emit):
-            if cid in self.clientes:
-                del self.clientes[cid]
-        self._to_clear_after_emit.clear()
+        self.clientes.pop(cid, None)
+        self._cli_snap.pop(cid, None)
+        self._pending_destroy = None
 
     def _hay_cola(self):
         return len(self.cola) > 0
 
     def _primer_bib_libre(self):
-        if self.bib[0].estado == "LIBRE":
+        if not self.b1.ocupado:
             return 0
-        if self.bib[1].estado == "LIBRE":
+        if not self.b2.ocupado:
             return 1
         return None
 
@@ -174,12 +363,7 @@ class SimulationEngine:
         rnd_val en [0,1)
         decide si es Pedir / Devolver / Consultar
         """
-        if rnd_val < self.p_pedir:
-            return "Pedir"
-        elif rnd_val < self.p_pedir + self.p_devolver:
-            return "Devolver"
-        else:
-            return "Consultar"
+        return self._TRX_NOMBRES[bisect.bisect_right(self._trx_cum, rnd_val)]
 
     def _sortear_transaccion_si_falta(self, cliente: Cliente):
         """
@@ -189,11 +373,11 @@ class SimulationEngine:
         if cliente.accion_actual:
             return "", cliente.accion_actual
 
-        rnd_trx_val = random.random()
+        rnd_trx_val = self._rand()
         tipo = self._elige_transaccion(rnd_trx_val)
         cliente.a_que_fue_inicial = tipo
         cliente.accion_actual = tipo
-        return fmt(rnd_trx_val, 4), tipo
+        return fmt4(rnd_trx_val), tipo
 
     def _demora_por_transaccion(self, tipo):
         """
@@ -202,13 +386,13 @@ class SimulationEngine:
         - Devolver -> Uniforme(1.5,2.5)
         - Pedir     -> Exponencial(media=6)
         """
-        r = random.random()
+        r = self._rand()
         if tipo == "Consultar":
-            demora = self.uni_a + (self.uni_b - self.uni_a) * r
+            demora = self.uni_a + self._uni_rango * r
         elif tipo == "Devolver":
-            demora = 1.5 + r * (2.5 - 1.5)
+            demora = 1.5 + r  # Uniforme(1.5, 2.5): el rango es 1
         else:  # "Pedir"
-            demora = -6.0 * math.log(1.0 - r)
+            demora = -6.0 * math.log1p(-r)  # = log(1 - r), más preciso con r chico
         return r, demora
 
     def _tomar_de_cola(self, idx_bib):
@@ -226,47 +410,37 @@ class SimulationEngine:
         cid = self.cola.popleft()
         c = self.clientes.get(cid)
         if c is None:
+            self._occupancy -= 1  # salió de la cola y no pasa a atención
             return False, "", "", "", ""
+        # de la cola pasa a atención: la ocupación no cambia
 
         trx_rnd, trx_tipo = self._sortear_transaccion_si_falta(c)
         c.estado = f"SA({idx_bib + 1})"
 
         rnd_srv, demora = self._demora_por_transaccion(c.accion_actual)
-        b.estado = "OCUPADO"
-        b.rnd = fmt(rnd_srv)
-        b.demora = fmt(demora)
+        b.ocupado = True
+        b.rnd = fmt2(rnd_srv)
+        b.demora = fmt2(demora)
         b.hora_num = self.clock + demora
-        b.hora = fmt(b.hora_num)
+        b.hora = fmt2(b.hora_num)
         b.cliente_id = cid
+        self._schedule("fin_atencion", idx_bib + 1, b.hora_num)
+        self._actualizar_snap(c)
 
         return True, b.rnd, b.demora, trx_rnd, trx_tipo
 
-    def _current_clients_occupying_spot(self):
-        """
-        Cuántos clientes están físicamente presentes:
-        - en cola
-        - siendo atendidos
-        - leyendo en la biblioteca
-        """
-        en_servicio = (1 if self.bib[0].estado == "OCUPADO" else 0) + \
-                      (1 if self.bib[1].estado == "OCUPADO" else 0)
-        return len(self.cola) + en_servicio + self.biblio_personas_cnt
-
     def _total_people_present_for_display(self):
         """
         Total físico dentro de la biblioteca:
         2 bibliotecarios + los clientes presentes (cola / atención / leyendo).
         """
-        return 2 + self._current_clients_occupying_spot()
+        return 2 + self._occupancy
 
     def _update_biblio_estado(self):
         """
         Biblioteca "Abierta" o "Cerrada" según capacidad.
         """
-        if self._total_people_present_for_display() >= MAX_CAPACITY:
-            self.biblio_estado = "Cerrada"
-        else:
-            self.biblio_estado = "Abierta"
+        self.biblio_estado = "Cerrada" if 2 + self._occupancy >= MAX_CAPACITY else "Abierta"
 
     def _integrar_estadisticas_hasta(self, new_time: float):
         """
@@ -274,60 +448,61 @@ class SimulationEngine:
         desde self.last_clock hasta new_time.
         """
         dt = new_time - self.last_clock
-
-        # reset por-iteración
-        self.last_iter_b1_libre = 0.0
-        self.last_iter_b2_libre = 0.0
+        self.last_clock = new_time
 
         if dt <= 0:
-            self.last_clock = new_time
+            # reset por-iteración
+            self.last_iter_b1_libre = 0.0
+            self.last_iter_b2_libre = 0.0
             return
 
-        # bibliotecario 1
-        if self.bib[0].estado == "LIBRE":
-            self.last_iter_b1_libre = dt
-            self.est_b1_libre_acum += dt
-
-        # bibliotecario 2
-        if self.bib[1].estado == "LIBRE":
-            self.last_iter_b2_libre = dt
-            self.est_b2_libre_acum += dt
-
-        # acumulador histórico total de ocio
-        self.est_bib_ocioso_acum = self.est_b1_libre_acum + self.est_b2_libre_acum
-
-        self.last_clock = new_time
+        # tiempo libre de cada bibliotecario en esta iteración
+        b1, b2 = self.b1, self.b2
+        l1 = 0.0 if b1.ocupado else dt
+        l2 = 0.0 if b2.ocupado else dt
+        self.last_iter_b1_libre = l1
+        self.last_iter_b2_libre = l2
+        if l1:
+            self.est_b1_libre_acum += l1
+        if l2:
+            self.est_b2_libre_acum += l2
+        if l1 or l2:
+            # acumulador histórico total de ocio (suma de ambos, incremental)
+            self.est_bib_ocioso_acum += l1 + l2
 
     def _proximo_evento(self):
         """
-        Devuelve el próximo evento como tupla (t, prioridad, tipo, data).
+        Devuelve el próximo evento como tupla (t, prioridad, tipo, data),
+        sin sacarlo de la agenda.
         prioridad:
           1 FIN_ATENCION_1
           2 FIN_ATENCION_2
-          3 FIN_LECTURA (desempate leve con cid)
+          3 FIN_LECTURA (desempata por cid)
           4 LLEGADA_CLIENTE
         """
-        cand = []
-
-        # Fines de atención
-        if self.bib[0].hora_num is not None:
-            cand.append((self.bib[0].hora_num, 1, "fin_atencion", {"i": 1}))
-        if self.bib[1].hora_num is not None:
-            cand.append((self.bib[1].hora_num, 2, "fin_atencion", {"i": 2}))
-
-        # Fines de lectura
-        for cid, c in self.clientes.items():
-            if c.estado == "EC LEYENDO" and c.fin_lect_num is not None:
-                cand.append((c.fin_lect_num, 3 + cid * 1e-6, "fin_lectura", {"cid": cid}))
-
-        # Próxima llegada
-        if self.next_arrival is not None:
-            cand.append((self.next_arrival, 4, "llegada", {}))
-
-        if not cand:
+        events = self._events
+        while events:
+            t, prio, ident, gen, tipo = events[0]
+            if self._gen.get((tipo, ident)) == gen:
+                break
+            heapq.heappop(events)  # entrada vieja (reprogramada o ya disparada)
+        else:
             return None
 
-        return min(cand, key=lambda x: (x[0], x[1]))
+        if tipo == "fin_atencion":
+            data = {"i": ident}
+        elif tipo == "fin_lectura":
+            data = {"cid": ident}
+        else:
+            data = {}
+        return t, prio, tipo, data
+
+    def _consumir_evento(self):
+        """
+        Saca de la agenda el evento que devolvió _proximo_evento.
+        """
+        t, prio, ident, gen, tipo = heapq.heappop(self._events)
+        del self._gen[(tipo, ident)]
 
     def hay_mas(self):
         """
@@ -341,22 +516,70 @@ class SimulationEngine:
         t, *_ = ne
         return (self.iteration < self.iter_limit) and (t <= self.time_limit)
 
+    # ---------- filas para la UI ----------
+    # Columnas base de cada fila, en orden; la plantilla arranca todo en ""
+    _ROW_KEYS = (
+        "evento", "reloj", "lleg_tiempo", "lleg_minuto", "lleg_id",
+        "trx_rnd", "trx_tipo", "lee_rnd", "lee_lugar", "lee_tiempo", "lee_fin",
+        "b1_estado", "b1_rnd", "b1_demora", "b1_hora",
+        "b2_estado", "b2_rnd", "b2_demora", "b2_hora",
+        "cola", "biblio_estado", "biblio_personas",
+        "est_b1_libre", "est_b2_libre", "est_bib_ocioso_acum", "est_cli_perm_acum",
+    )
+    _ROW_TEMPLATE = dict.fromkeys(_ROW_KEYS, "")
+
+    def _fila_comun(self, evento):
+        """
+        Fila nueva copiada de la plantilla (sin re-hashear las claves), con
+        los campos que todos los eventos llenan igual. Cada evento completa
+        después los suyos.
+        """
+        row = self._ROW_TEMPLATE.copy()
+        b1, b2 = self.b1, self.b2
+        row["evento"] = evento
+        row["reloj"] = fmt2(self.clock)
+        row["lleg_minuto"] = fmt2(self.next_arrival)
+        row["b1_estado"] = b1.estado
+        row["b1_rnd"] = self.last_b[1]["rnd"]
+        row["b1_demora"] = self.last_b[1]["demora"]
+        row["b1_hora"] = b1.hora
+        row["b2_estado"] = b2.estado
+        row["b2_rnd"] = self.last_b[2]["rnd"]
+        row["b2_demora"] = self.last_b[2]["demora"]
+        row["b2_hora"] = b2.hora
+        row["cola"] = len(self.cola)
+        row["biblio_estado"] = self.biblio_estado
+        row["biblio_personas"] = 2 + self._occupancy
+        row["est_b1_libre"] = fmt2(self.last_iter_b1_libre)
+        row["est_b2_libre"] = fmt2(self.last_iter_b2_libre)
+        row["est_bib_ocioso_acum"] = fmt2(self.est_bib_ocioso_acum)
+        row["est_cli_perm_acum"] = fmt2(self.cli_perm_acum_total)
+        return row
+
     # ---------- snapshots para la UI ----------
+    def _actualizar_snap(self, c):
+        """
+        Actualiza en el snapshot las columnas del cliente `c`.
+        Se llama solo para los clientes que cambiaron en el evento.
+        """
+        self._cli_snap[c.id] = {
+            "estado": c.estado,
+            "hora_llegada": c.hora_llegada_str,
+            "a_que_fue": c.accion_actual or c.a_que_fue_inicial,
+            "cuando_termina": c.cuando_termina_leer,
+        }
+
     def build_client_snapshot(self):
         """
         Snapshot para las columnas dinámicas Cliente N.
         Incluye clientes “DESTRUCCION” en ESTA iteración,
         se limpian recién en la siguiente iteración.
+
+        Se mantiene al día evento a evento (_actualizar_snap), así que se
+        devuelve el mismo dict: es de solo lectura y vale hasta el
+        próximo evento.
         """
-        snap = {}
-        for cid, c in self.clientes.items():
-            snap[cid] = {
-                "estado": c.estado,
-                "hora_llegada": fmt(c.hora_llegada, 2),
-                "a_que_fue": c.accion_actual or c.a_que_fue_inicial,
-                "cuando_termina": c.cuando_termina_leer,
-            }
-        return snap
+        return self._cli_snap
 
     def snapshot_estadisticas(self):
         """
@@ -402,6 +625,7 @@ class SimulationEngine:
         if t > self.time_limit:
             raise StopIteration("Se alcanzó el tiempo límite X.")
 
+        self._consumir_evento()
         if tipo == "llegada":
             row, snap = self._evento_llegada()
         elif tipo == "fin_atencion":
@@ -440,7 +664,7 @@ class SimulationEngine:
         trx_tipo = ""
 
         # Chequeo de capacidad
-        if self._current_clients_occupying_spot() >= (MAX_CAPACITY - 2):
+        if self._occupancy >= (MAX_CAPACITY - 2):
             # No entra → destruido Forzado
             c.estado = "DESTRUCCION"
             c.fin_lect_num = None
@@ -453,9 +677,10 @@ class SimulationEngine:
             self.cli_completados += 1
 
             # Se lo limpia en el próximo evento
-            self._to_clear_after_emit.add(c.id)
+            self._pending_destroy = c.id
         else:
-            # Puede entrar
+            # Puede entrar (a atención o a la cola)
+            self._occupancy += 1
             libre = self._primer_bib_libre()
             if (not self._hay_cola()) and (libre is not None):
                 # Pasa directo con bibliotecario libre
@@ -464,12 +689,13 @@ class SimulationEngine:
 
                 rnd_srv, demora = self._demora_por_transaccion(c.accion_actual)
                 b = self.bib[libre]
-                b.estado = "OCUPADO"
-                b.rnd = fmt(rnd_srv)
-                b.demora = fmt(demora)
+                b.ocupado = True
+                b.rnd = fmt2(rnd_srv)
+                b.demora = fmt2(demora)
                 b.hora_num = self.clock + demora
-                b.hora = fmt(b.hora_num)
+                b.hora = fmt2(b.hora_num)
                 b.cliente_id = c.id
+                self._schedule("fin_atencion", libre + 1, b.hora_num)
 
                 # Guardamos para mostrar esta iteración
                 self.last_b[libre + 1]["rnd"] = b.rnd
@@ -483,9 +709,11 @@ class SimulationEngine:
                 self.cola.append(c.id)
 
             self.clientes[cid] = c
+        self._actualizar_snap(c)
 
         # Programar próxima llegada
         self.next_arrival = self.clock + self.t_inter
+        self._schedule("llegada", 0, self.next_arrival)
 
         # Actualizar estado biblioteca
         self._update_biblio_estado()
@@ -493,34 +721,11 @@ class SimulationEngine:
         # Acumular permanencia global
         self.cli_perm_acum_total += event_perm_sum
 
-        row = {
-            "evento": f"LLEGADA_CLIENTE({cid})",
-            "reloj": fmt(self.clock, 2),
-            "lleg_tiempo": fmt(self.t_inter, 2),
-            "lleg_minuto": fmt(self.next_arrival, 2),
-            "lleg_id": str(cid),
-            "trx_rnd": trx_rnd,
-            "trx_tipo": trx_tipo,
-            "lee_rnd": "",
-            "lee_lugar": "",
-            "lee_tiempo": "",
-            "lee_fin": "",
-            "b1_estado": self.bib[0].estado,
-            "b1_rnd": self.last_b[1]["rnd"],
-            "b1_demora": self.last_b[1]["demora"],
-            "b1_hora": self.bib[0].hora,
-            "b2_estado": self.bib[1].estado,
-            "b2_rnd": self.last_b[2]["rnd"],
-            "b2_demora": self.last_b[2]["demora"],
-            "b2_hora": self.bib[1].hora,
-            "cola": len(self.cola),
-            "biblio_estado": self.biblio_estado,
-            "biblio_personas": self._total_people_present_for_display(),
-            "est_b1_libre": fmt(self.last_iter_b1_libre),
-            "est_b2_libre": fmt(self.last_iter_b2_libre),
-            "est_bib_ocioso_acum": fmt(self.est_bib_ocioso_acum),
-            "est_cli_perm_acum": fmt(self.cli_perm_acum_total),
-        }
+        row = self._fila_comun(f"LLEGADA_CLIENTE({cid})")
+        row["lleg_tiempo"] = fmt2(self.t_inter)
+        row["lleg_id"] = str(cid)
+        row["trx_rnd"] = trx_rnd
+        row["trx_tipo"] = trx_tipo
 
         cli_snap = self.build_client_snapshot()
         return row, cli_snap
@@ -554,8 +759,8 @@ class SimulationEngine:
 
         if c.accion_actual == "Pedir":
             # decide lectura en casa vs en biblioteca
-            r = random.random()
-            lee_rnd = fmt(r, 4)
+            r = self._rand()
+            lee_rnd = fmt4(r)
             if r < self.p_retira:
                 # se va con el libro -> destrucción inmediata
                 c.estado = "DESTRUCCION"
@@ -565,17 +770,18 @@ class SimulationEngine:
                 event_perm_sum += tiempo_perm
                 self.sum_tiempo_en_sistema += tiempo_perm
                 self.cli_completados += 1
-                self._to_clear_after_emit.add(c.id)
+                self._pending_destroy = c.id
             else:
                 # se queda a leer en biblioteca
                 c.estado = "EC LEYENDO"
                 fin_lec = self.clock + self.t_lect_biblio
                 c.fin_lect_num = fin_lec
-                c.cuando_termina_leer = fmt(fin_lec, 2)
+                c.cuando_termina_leer = fmt2(fin_lec)
+                self._schedule("fin_lectura", cid, fin_lec)
                 lee_lugar = "Biblioteca"
-                lee_tiempo = fmt(self.t_lect_biblio, 2)
+                lee_tiempo = fmt2(self.t_lect_biblio)
                 lee_fin = c.cuando_termina_leer
-                self.biblio_personas_cnt += 1
+                self._occupancy += 1
         else:
             # Devolver / Consultar => sale del sistema
             c.estado = "DESTRUCCION"
@@ -585,10 +791,12 @@ class SimulationEngine:
             event_perm_sum += tiempo_perm
             self.sum_tiempo_en_sistema += tiempo_perm
             self.cli_completados += 1
-            self._to_clear_after_emit.add(c.id)
+            self._pending_destroy = c.id
+        self._actualizar_snap(c)
 
-        # bibliotecario queda libre
-        b.estado = "LIBRE"
+        # bibliotecario queda libre (su cliente deja de ocupar lugar en atención)
+        self._occupancy -= 1
+        b.ocupado = False
         b.rnd = ""
         b.demora = ""
         b.hora = ""
@@ -607,34 +815,13 @@ class SimulationEngine:
 
         self.cli_perm_acum_total += event_perm_sum
 
-        row = {
-            "evento": f"FIN_ATENCION_{i}({cid})",
-            "reloj": fmt(self.clock, 2),
-            "lleg_tiempo": "",
-            "lleg_minuto": fmt(self.next_arrival, 2),
-            "lleg_id": "",
-            "trx_rnd": self.last_b[i]["trx_rnd"],
-            "trx_tipo": self.last_b[i]["trx_tipo"],
-            "lee_rnd": lee_rnd,
-            "lee_lugar": lee_lugar,
-            "lee_tiempo": lee_tiempo,
-            "lee_fin": lee_fin,
-            "b1_estado": self.bib[0].estado,
-            "b1_rnd": self.last_b[1]["rnd"],
-            "b1_demora": self.last_b[1]["demora"],
-            "b1_hora": self.bib[0].hora,
-            "b2_estado": self.bib[1].estado,
-            "b2_rnd": self.last_b[2]["rnd"],
-            "b2_demora": self.last_b[2]["demora"],
-            "b2_hora": self.bib[1].hora,
-            "cola": len(self.cola),
-            "biblio_estado": self.biblio_estado,
-            "biblio_personas": self._total_people_present_for_display(),
-            "est_b1_libre": fmt(self.last_iter_b1_libre),
-            "est_b2_libre": fmt(self.last_iter_b2_libre),
-            "est_bib_ocioso_acum": fmt(self.est_bib_ocioso_acum),
-            "est_cli_perm_acum": fmt(self.cli_perm_acum_total),
-        }
+        row = self._fila_comun(f"FIN_ATENCION_{i}({cid})")
+        row["trx_rnd"] = self.last_b[i]["trx_rnd"]
+        row["trx_tipo"] = self.last_b[i]["trx_tipo"]
+        row["lee_rnd"] = lee_rnd
+        row["lee_lugar"] = lee_lugar
+        row["lee_tiempo"] = lee_tiempo
+        row["lee_fin"] = lee_fin
 
         cli_snap = self.build_client_snapshot()
         return row, cli_snap
@@ -661,19 +848,20 @@ class SimulationEngine:
         c.fin_lect_num = None
         c.cuando_termina_leer = ""
         c.accion_actual = "Devolver"
-        self.biblio_personas_cnt = max(0, self.biblio_personas_cnt - 1)
+        # deja la sala y pasa a atención o a la cola: la ocupación no cambia
 
         libre = self._primer_bib_libre()
         if libre is not None:
             c.estado = f"SA({libre + 1})"
             rnd_srv, demora = self._demora_por_transaccion(c.accion_actual)
             b = self.bib[libre]
-            b.estado = "OCUPADO"
-            b.rnd = fmt(rnd_srv)
-            b.demora = fmt(demora)
+            b.ocupado = True
+            b.rnd = fmt2(rnd_srv)
+            b.demora = fmt2(demora)
             b.hora_num = self.clock + demora
-            b.hora = fmt(b.hora_num)
+            b.hora = fmt2(b.hora_num)
             b.cliente_id = c.id
+            self._schedule("fin_atencion", libre + 1, b.hora_num)
 
             self.last_b[libre + 1]["rnd"] = b.rnd
             self.last_b[libre + 1]["demora"] = b.demora
@@ -683,39 +871,19 @@ class SimulationEngine:
             c.estado = "EN COLA"
             c.hora_entrada_cola = self.clock
             self.cola.append(c.id)
+        self._actualizar_snap(c)
 
         self._update_biblio_estado()
 
         self.cli_perm_acum_total += event_perm_sum  # suma 0
 
-        row = {
-            "evento": f"FIN_LECTURA({cid})",
-            "reloj": fmt(self.clock, 2),
-            "lleg_tiempo": "",
-            "lleg_minuto": fmt(self.next_arrival, 2),
-            "lleg_id": "",
-            "trx_rnd": "" if libre is None else self.last_b[libre + 1]["trx_rnd"],
-            "trx_tipo": "" if libre is None else self.last_b[libre + 1]["trx_tipo"],
-            "lee_rnd": "",
-            "lee_lugar": "",
-            "lee_tiempo": "",
-            "lee_fin": "",
-            "b1_estado": self.bib[0].estado,
-            "b1_rnd": self.last_b[1]["rnd"],
-            "b1_demora": self.bib[0].demora,
-            "b1_hora": self.bib[0].hora,
-            "b2_estado": self.bib[1].estado,
-            "b2_rnd": self.last_b[2]["rnd"],
-            "b2_demora": self.bib[1].demora,
-            "b2_hora": self.bib[1].hora,
-            "cola": len(self.cola),
-            "biblio_estado": self.biblio_estado,
-            "biblio_personas": self._total_people_present_for_display(),
-            "est_b1_libre": fmt(self.last_iter_b1_libre),
-            "est_b2_libre": fmt(self.last_iter_b2_libre),
-            "est_bib_ocioso_acum": fmt(self.est_bib_ocioso_acum),
-            "est_cli_perm_acum": fmt(self.cli_perm_acum_total),
-        }
+        row = self._fila_comun(f"FIN_LECTURA({cid})")
+        if libre is not None:
+            row["trx_rnd"] = self.last_b[libre + 1]["trx_rnd"]
+            row["trx_tipo"] = self.last_b[libre + 1]["trx_tipo"]
+        # en FIN_LECTURA la demora mostrada es la del servicio en curso
+        row["b1_demora"] = self.b1.demora
+        row["b2_demora"] = self.b2.demora
 
         cli_snap = self.build_client_snapshot()
         return row, cli_snap
@@ -769,6 +937,11 @@ class SimulationWindow(tk.Toplevel):
     - Encabezado doble fijo (grupos arriba + nombres de columna abajo).
     """
 
+    # Columnas que se agregan por cada cliente nuevo (sufijo del id, título, ancho)
+    CLIENTE_CAMPOS = ("estado", "hora_llegada", "a_que_fue", "cuando_termina")
+    CLIENTE_TEXTOS = ("ESTADO", "HORA_LLEGADA", "A QUE FUE", "Cuando termina de leer")
+    CLIENTE_ANCHOS = (110, 130, 120, 180)
+
     def __init__(self, master, config_dict):
         super().__init__(master)
         self.title("Vector de Estado - Simulación (Virtualizado / SQLite)")
@@ -780,21 +953,40 @@ class SimulationWindow(tk.Toplevel):
         self.modo_auto = bool(config_dict["simulacion"].get("modo_auto", False))
 
         self.stats_win = None
-        self.known_clients = []  # clientes que ya generaron columnas dinámicas
+        self._layout_pendiente = False  # hay columnas nuevas sin aplicar (ver _refrescar_vista)
 
         # --- DB temporal en disco (para no comer RAM con miles de filas) ---
-        tmpfile = tempfile.NamedTemporaryFile(prefix="sim_", suffix=".db", delete=False)
-        self._db_path = tmpfile.name
-        tmpfile.close()
-        self._db_conn = sqlite3.connect(self._db_path)
+        if self.DB_EN_MEMORIA:
+            self._db_path = None
+            self._db_conn = sqlite3.connect(":memory:")
+        else:
+            tmpfile = tempfile.NamedTemporaryFile(prefix="sim_", suffix=".db", delete=False)
+            self._db_path = tmpfile.name
+            tmpfile.close()
+            self._db_conn = sqlite3.connect(self._db_path)
         self._init_db()
-        self.total_rows = 0  # cuántas filas totales ya guardamos
+        self.total_rows = 0  # cuántas filas totales ya guardamos (en DB + en _row_buf)
+        self._row_buf = []   # filas todavía no escritas en la DB (ver _flush_rows)
+        self._page_cache = OrderedDict()  # nro de página -> filas guardadas (ver _pagina)
 
         # Constantes de layout visual
         self.row_height = 24              # altura de cada fila dibujada
         self.header_h_group = 30          # alto fila "grupos"
         self.header_h_total = 60          # alto total header (grupos + nombres columnas)
-        self.col_positions = []           # [(x0,x1), ...] acumulado según self.columns
+        self.col_positions = [0]          # x de inicio de cada columna + ancho total al final
+        self._redraw_pending = False      # ya hay un repintado agendado (ver _redraw_visible_rows)
+        # fuentes creadas una vez (Tk no tiene que resolver la tupla en cada item)
+        self._cell_font = tkfont.Font(self, family="Segoe UI", size=9)
+        self._header_font = tkfont.Font(self, family="Segoe UI", size=8)
+        self._group_font = tkfont.Font(self, family="Segoe UI", size=9, weight="bold")
+        self._rendered = {}               # fila -> ids de sus items en body_canvas
+        self._col_lines = []              # líneas verticales de columnas (ver _dibujar_lineas_columnas)
+        self._alto_lineas = 0
+        self._grupos_dibujados = 0        # grupos / columnas que ya tienen header (ver _draw_group_headers)
+        self._scroll_w = self._scroll_h = None  # última scrollregion aplicada (ver _update_scrollregion)
+        self._filas_refrescadas = 0       # total_rows en el último _refrescar_vista
+        self._alto_vista = None           # alto del body_canvas en el último <Configure>
+        self._cols_dibujadas = 0
 
         # --- FRAME raíz ---
         root = ttk.Frame(self, padding=8)
@@ -822,11 +1014,17 @@ class SimulationWindow(tk.Toplevel):
             ttk.Button(top, text="Siguiente evento", command=self.on_next).pack(side="right")
 
         # --- Definición de columnas base y grupos de encabezado ---
-        self.columns = []
+        # Listas paralelas (id, título, ancho): el dibujado de celdas las
+        # indexa directo en vez de buscar en un dict por columna.
+        self._col_ids = []
+        self._col_texts = []
+        self._col_widths = []
         self.groups = []
 
         def add_col(cid, text, w):
-            self.columns.append({"id": cid, "text": text, "w": w})
+            self._col_ids.append(cid)
+            self._col_texts.append(text)
+            self._col_widths.append(w)
 
         # Grupo "" (iteración/evento/reloj)
         add_col("iteracion", "Numero de iteracion", 160)
@@ -875,6 +1073,13 @@ class SimulationWindow(tk.Toplevel):
         # Grupo ESTADISTICAS · CLIENTES
         add_col("est_cli_perm_acum", "ACUMULADOR TIEMPO PERMANENCIA", 270)
 
+        # Armado de filas (ver _build_row_map): primero van las columnas
+        # base, en este orden, y después las de cada cliente a partir de
+        # la posición guardada en _inicio_cliente.
+        self._base_keys = tuple(self._col_ids)
+        self._idx_iteracion = self._base_keys.index("iteracion")
+        self._inicio_cliente = {}  # cid -> índice de su primera columna
+
         # Indices de grupos para header superior
         self.groups = [
             ("", 0, 2),
@@ -957,12 +1162,37 @@ class SimulationWindow(tk.Toplevel):
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     # ---------- manejo de DB / scroll virtualizado ----------
+    # Filas que se juntan en memoria antes de escribirlas juntas en SQLite
+    FILAS_POR_LOTE_DB = 1000
+    # Filas por sentencia INSERT (cada una son dos parámetros; SQLite viejo
+    # admite hasta 999 por sentencia)
+    FILAS_POR_INSERT = 400
+    # True = la DB vive entera en RAM (":memory:"): inserta y lee más rápido,
+    # pero cada fila lleva las columnas de todos los clientes vistos, así que
+    # en corridas largas crece mucho. Por defecto va a un archivo temporal.
+    DB_EN_MEMORIA = False
+    # Separador de los valores de una fila guardada (no aparece en los datos)
+    SEP_CAMPOS = "\x1f"
+    # Lecturas de la DB por páginas de filas, con las últimas páginas en caché
+    FILAS_POR_PAGINA = 64
+    PAGINAS_EN_CACHE = 32
+
     def _init_db(self):
         cur = self._db_conn.cursor()
+        # Es una DB temporal que se borra al cerrar: no hace falta fsync
+        # nunca, y como hay una sola conexión el lock exclusivo evita el
+        # archivo -shm de WAL (va antes de activar WAL)
+        cur.execute("PRAGMA locking_mode=EXCLUSIVE")
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=OFF")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA cache_size=-65536")
+        # idx = número de fila (desde 0), lo pone _flush_rows. Es el rowid
+        # de la tabla, así que leer un rango de filas es un rango de la clave
         cur.execute("""
             CREATE TABLE IF NOT EXISTS filas (
-                idx INTEGER PRIMARY KEY AUTOINCREMENT,
-                data_json TEXT NOT NULL
+                idx INTEGER PRIMARY KEY,
+                data TEXT NOT NULL
             )
         """)
         self._db_conn.commit()
@@ -972,10 +1202,12 @@ class SimulationWindow(tk.Toplevel):
             self._db_conn.close()
         except Exception:
             pass
-        try:
-            os.remove(self._db_path)
-        except Exception:
-            pass
+        if self._db_path is not None:
+            for path in (self._db_path, self._db_path + "-wal", self._db_path + "-shm"):
+                try:
+                    os.remove(path)
+                except Exception:
+                    pass
         self.destroy()
 
     def _update_scrollregion(self):
@@ -983,32 +1215,71 @@ class SimulationWindow(tk.Toplevel):
         Ajusta las áreas de scroll de ambos canvas según
         - ancho total de columnas
         - cantidad total de filas
+        Solo reconfigura lo que cambió: el header solo depende del ancho.
         """
-        total_w = sum(c["w"] for c in self.columns)
+        total_w = self.col_positions[-1]
         total_h_rows = self.total_rows * self.row_height
 
-        self.header_canvas.configure(
-            scrollregion=(0, 0, total_w, self.header_h_total)
-        )
-        self.body_canvas.configure(
-            scrollregion=(0, 0, total_w, total_h_rows)
+        if total_w != self._scroll_w:
+            self.header_canvas.configure(
+                scrollregion=(0, 0, total_w, self.header_h_total)
+            )
+        if (total_w, total_h_rows) != (self._scroll_w, self._scroll_h):
+            self.body_canvas.configure(
+                scrollregion=(0, 0, total_w, total_h_rows)
+            )
+        self._scroll_w = total_w
+        self._scroll_h = total_h_rows
+
+        # estirar las líneas de columna hasta la última fila
+        if total_h_rows != self._alto_lineas:
+            self._alto_lineas = total_h_rows
+            coords = self.body_canvas.coords
+            for item, x in zip(self._col_lines, self.col_positions):
+                coords(item, x, 0, x, total_h_rows)
+
+    def _dibujar_lineas_columnas(self):
+        """
+        Una línea vertical por borde de columna, de arriba hasta la última
+        fila: así cada fila dibuja solo su fondo, su borde inferior y los
+        textos, en vez de un rectángulo por celda.
+        Solo crea las líneas de los bordes que todavía no tienen una.
+        """
+        canvas = self.body_canvas
+        alto = self.total_rows * self.row_height
+        if alto != self._alto_lineas:
+            # las existentes se estiran en _update_scrollregion; acá puede
+            # no haber pasado todavía
+            self._alto_lineas = alto
+            for item, x in zip(self._col_lines, self.col_positions):
+                canvas.coords(item, x, 0, x, alto)
+        self._col_lines.extend(
+            canvas.create_line(x, 0, x, alto, fill=CELL_BORDER, tags="colline")
+            for x in self.col_positions[len(self._col_lines):]
         )
 
     def _recompute_columns_layout(self):
         """
-        Recalcula self.col_positions = [(x0,x1), ...] acumulando widths,
-        actualiza scrollregion, redibuja header y filas visibles.
+        Extiende self.col_positions = [0, x1, x2, ..., ancho_total] con las
+        columnas agregadas (las columnas solo se agregan al final), actualiza
+        scrollregion, dibuja el header de lo nuevo y redibuja filas visibles.
+        Si no hay columnas nuevas no hace nada: scroll y resize nunca
+        necesitan tocar el layout (el header se desplaza solo con xview).
         """
-        self.col_positions = []
-        acc = 0
-        for c in self.columns:
-            x0 = acc
-            x1 = acc + c["w"]
-            self.col_positions.append((x0, x1))
-            acc = x1
+        xs = self.col_positions
+        if len(xs) - 1 == len(self._col_widths):
+            return
+        x = xs[-1]
+        for w in self._col_widths[len(xs) - 1:]:
+            x += w
+            xs.append(x)
 
         self._update_scrollregion()
         self._draw_group_headers()
+        # las filas ya dibujadas no tienen las columnas nuevas: van de cero
+        self.body_canvas.delete("rowcell")
+        self._rendered.clear()
+        self._dibujar_lineas_columnas()
         self._redraw_visible_rows()
 
     def _draw_group_headers(self):
@@ -1017,8 +1288,13 @@ class SimulationWindow(tk.Toplevel):
         - Fila superior de grupos (LLEGADA_CLIENTE, TRANSACCION, etc.)
         - Fila inferior con los nombres de cada columna (Evento, Reloj, etc.)
         Ambas quedan fijas.
+        Solo dibuja los grupos y columnas que se agregaron desde la última
+        vez (cada cliente nuevo suma uno al final); lo anterior no cambia.
         """
-        self.header_canvas.delete("all")
+        g_desde = self._grupos_dibujados
+        c_desde = self._cols_dibujadas
+        self._grupos_dibujados = len(self.groups)
+        self._cols_dibujadas = len(self._col_texts)
 
         xs = self.col_positions
         hg = self.header_h_group
@@ -1032,11 +1308,11 @@ class SimulationWindow(tk.Toplevel):
         group_boundaries = set()
 
         # 1) Cajas de grupo (fila superior)
-        for text, i0, i1 in self.groups:
-            if i0 >= len(xs) or i1 >= len(xs):
+        for text, i0, i1 in self.groups[g_desde:]:
+            if i1 + 1 >= len(xs):
                 continue
-            x0 = xs[i0][0]
-            x1 = xs[i1][1]
+            x0 = xs[i0]
+            x1 = xs[i1 + 1]
 
             # rectángulo del grupo
             self.header_canvas.create_rectangle(
@@ -1050,7 +1326,7 @@ class SimulationWindow(tk.Toplevel):
                     (x0 + x1) / 2, hg / 2,
                     text=text,
                     anchor="center",
-                    font=("Segoe UI", 9, "bold"),
+                    font=self._group_font,
                     fill="#000000"
                 )
 
@@ -1064,8 +1340,8 @@ class SimulationWindow(tk.Toplevel):
             group_boundaries.add(x1)
 
         # 2) Encabezado de cada columna (fila inferior)
-        for col_idx, col in enumerate(self.columns):
-            x0, x1 = xs[col_idx]
+        for col_idx, text in enumerate(self._col_texts[c_desde:], c_desde):
+            x0, x1 = xs[col_idx], xs[col_idx + 1]
             # fondo de celda header de columna
             self.header_canvas.create_rectangle(
                 x0, hg, x1, ht,
@@ -1077,14 +1353,14 @@ class SimulationWindow(tk.Toplevel):
             self.header_canvas.create_text(
                 (x0 + x1) / 2,
                 hg + (ht - hg) / 2,
-                text=col["text"],
+                text=text,
                 anchor="center",
-                font=("Segoe UI", 8),
+                font=self._header_font,
                 fill="#000000"
             )
 
         # 3) Líneas verticales finas en límites de columnas
-        for _, x1 in xs:
+        for x1 in xs[c_desde + 1:]:
             self.header_canvas.create_line(
                 x1, 0, x1, ht,
                 fill=fine_line_color
@@ -1101,134 +1377,221 @@ class SimulationWindow(tk.Toplevel):
                 width=1
             )
 
-        # asegurar scrollregion del header
-        self.header_canvas.configure(
-            scrollregion=(0, 0, sum(c["w"] for c in self.columns), ht)
-        )
-
     def _build_row_map(self, base_row: dict, cli_snap: dict, iteration_value: int):
         """
-        Construye un dict {col_id: valor} alineado con self.columns actual.
-        Esto es lo que guardaremos en SQLite.
-        """
-        row_map = {}
-        for col in self.columns:
-            col_id = col["id"]
-            if col_id.startswith("c"):
-                # columnas dinámicas de clientes: cX_estado, cX_hora_llegada, etc.
-                parts = col_id.split("_", 1)
-                prefix = parts[0]
-                campo = parts[1] if len(parts) > 1 else ""
-                cid_str = prefix[1:] if prefix.startswith("c") else prefix
-                try:
-                    cid_int = int(cid_str)
-                except ValueError:
-                    cid_int = None
-
-                if cid_int is not None and cid_int in cli_snap:
-                    cli_info = cli_snap[cid_int]
-                    if campo == "estado":
-                        row_map[col_id] = cli_info.get("estado", "")
-                    elif campo == "hora_llegada":
-                        row_map[col_id] = cli_info.get("hora_llegada", "")
-                    elif campo == "a_que_fue":
-                        row_map[col_id] = cli_info.get("a_que_fue", "")
-                    elif campo == "cuando_termina":
-                        row_map[col_id] = cli_info.get("cuando_termina", "")
-                    else:
-                        row_map[col_id] = ""
-                else:
-                    row_map[col_id] = ""
-            else:
-                if col_id == "iteracion":
-                    row_map[col_id] = str(iteration_value)
-                else:
-                    v = base_row.get(col_id, "")
-                    row_map[col_id] = "" if v == "" else str(v)
-        return row_map
+        Construye la fila como lista de strings, una por columna, en el
+        orden de self._col_ids actual. Esto es lo que guardaremos en SQLite.
+        Las columnas base salen directo de base_row; de las de clientes
+        solo se llenan las de los clientes presentes en cli_snap (cada uno
+        en su posición fija), no se recorren las de todos los clientes
+        vistos. La fila termina en la última columna con algo: lo que
+        sigue es vacío (ver _save_row_to_db).
+        """
+        get = base_row.get
+        row = [str(get(k, "")) for k in self._base_keys]
+        row[self._idx_iteracion] = str(iteration_value)
+
+        inicio = self._inicio_cliente
+        campos = self.CLIENTE_CAMPOS
+        ancho = len(campos)
+        for cid, cli_info in cli_snap.items():
+            i = inicio[cid]
+            falta = i + ancho - len(row)
+            if falta > 0:
+                row.extend([""] * falta)
+            row[i:i + ancho] = [cli_info.get(campo, "") for campo in campos]
+        return row
+
+    def _save_row_to_db(self, row: list):
+        """
+        Agrega la fila al lote pendiente y actualiza el contador.
+        El lote se escribe en SQLite al llegar a FILAS_POR_LOTE_DB filas.
+        La vista (scrollregion + filas) se actualiza aparte, con _refrescar_vista().
+        """
+        # Se guarda como un solo string con los valores separados por
+        # SEP_CAMPOS; los "" del final (columnas de clientes que ya no
+        # están) no se guardan y al leer se completan vacíos.
+        self._row_buf.append(self.SEP_CAMPOS.join(row).rstrip(self.SEP_CAMPOS))
+        self.total_rows += 1
+        if len(self._row_buf) >= self.FILAS_POR_LOTE_DB:
+            self._flush_rows()
 
-    def _save_row_to_db(self, row_map: dict):
+    def _flush_rows(self):
         """
-        Inserta la fila en SQLite y actualiza contadores/scroll.
+        Escribe en SQLite las filas pendientes, en una sola transacción.
+        Usa INSERTs de varias filas (VALUES (?,?),(?,?),...): SQLite ejecuta
+        una sentencia por tramo de FILAS_POR_INSERT y no una por fila.
         """
-        cur = self._db_conn.cursor()
-        cur.execute(
-            "INSERT INTO filas (data_json) VALUES (?)",
-            (json.dumps(row_map),)
-        )
-        self._db_conn.commit()
-        self.total_rows += 1
-        self._update_scrollregion()
+        buf = self._row_buf
+        if not buf:
+            return
+        n = self.FILAS_POR_INSERT
+        primera = self.total_rows - len(buf)  # número de fila de buf[0]
+        conn = self._db_conn
+        with conn:
+            for i in range(0, len(buf), n):
+                tramo = buf[i:i + n]
+                params = []
+                for j, data in enumerate(tramo, primera + i):
+                    params += (j, data)
+                conn.execute(
+                    "INSERT INTO filas (idx, data) VALUES " + ",".join(["(?,?)"] * len(tramo)),
+                    params
+                )
+        self._row_buf = []
 
     def _fetch_rows_range(self, start_index: int, end_index: int):
         """
-        Lee filas [start_index, end_index) desde SQLite,
-        y las devuelve como lista de dicts.
+        Recorre las filas [start_index, end_index) (de SQLite o del lote
+        sin escribir) y las va entregando como listas de strings (una por
+        fila, en el orden de columnas; puede traer menos valores que
+        columnas, ver _save_row_to_db). Es un generador: cada fila se
+        separa recién cuando se la pide, sin armar una lista con todas.
         """
         if start_index < 0:
             start_index = 0
         if end_index > self.total_rows:
             end_index = self.total_rows
-        limit = end_index - start_index
-        if limit <= 0:
-            return []
+        if end_index - start_index <= 0:
+            return
 
-        cur = self._db_conn.cursor()
-        cur.execute(
-            "SELECT data_json FROM filas ORDER BY idx LIMIT ? OFFSET ?",
-            (limit, start_index)
+        sep = self.SEP_CAMPOS
+        # Las últimas filas pueden estar todavía en el lote sin escribir
+        en_db = self.total_rows - len(self._row_buf)
+        fin_db = min(end_index, en_db)
+        if fin_db > start_index:
+            fpp = self.FILAS_POR_PAGINA
+            for p in range(start_index // fpp, (fin_db - 1) // fpp + 1):
+                p0 = p * fpp
+                for d in self._pagina(p, en_db)[max(start_index - p0, 0):fin_db - p0]:
+                    yield d.split(sep)
+        if end_index > en_db:
+            for d in self._row_buf[max(start_index, en_db) - en_db:end_index - en_db]:
+                yield d.split(sep)
+
+    def _pagina(self, p, en_db):
+        """
+        Filas guardadas (strings sin separar) de la página p que ya están en
+        la DB. Las páginas completas no cambian más, así que quedan en un
+        caché LRU; una página incompleta se lee de nuevo cada vez.
+        """
+        cache = self._page_cache
+        pagina = cache.get(p)
+        if pagina is not None:
+            cache.move_to_end(p)
+            return pagina
+
+        p0 = p * self.FILAS_POR_PAGINA
+        p1 = min(p0 + self.FILAS_POR_PAGINA, en_db)
+        cur = self._db_conn.execute(
+            "SELECT data FROM filas WHERE idx >= ? AND idx < ? ORDER BY idx",
+            (p0, p1)
         )
-        rows = []
-        for (dj,) in cur.fetchall():
-            rows.append(json.loads(dj))
-        return rows
+        pagina = [d for (d,) in cur]
+        if p1 - p0 == self.FILAS_POR_PAGINA:
+            cache[p] = pagina
+            if len(cache) > self.PAGINAS_EN_CACHE:
+                cache.popitem(last=False)
+        return pagina
 
     def _redraw_visible_rows(self):
         """
-        Borra las celdas dibujadas en body_canvas y vuelve a dibujar
-        SOLO las filas visibles en pantalla según el scroll actual.
+        Agenda un repintado de las filas visibles para cuando Tk quede
+        ocioso. Varias llamadas seguidas (un giro de rueda, un resize,
+        una tanda de eventos) se juntan en un solo repintado.
         """
-        self.body_canvas.delete("rowcell")
+        if self._redraw_pending:
+            return
+        self._redraw_pending = True
+        self.after_idle(self._flush_redraw)
+
+    def _flush_redraw(self):
+        self._redraw_pending = False
+        if self.winfo_exists():
+            self._do_redraw_visible_rows()
+
+    def _do_redraw_visible_rows(self):
+        """
+        Deja dibujadas SOLO las filas visibles en pantalla según el scroll
+        actual: borra las que salieron de la vista y dibuja las que
+        entraron. Las que siguen visibles no se tocan (una fila guardada no
+        cambia; si cambian las columnas, _recompute_columns_layout borra todo).
+        """
+        canvas = self.body_canvas
 
         # coordenadas visibles actuales
-        y0 = self.body_canvas.canvasy(0)
-        h = self.body_canvas.winfo_height()
+        y0 = canvas.canvasy(0)
+        h = canvas.winfo_height()
         if h <= 0:
             return
 
         first_row = int(y0 // self.row_height)
-        last_row = int((y0 + h) // self.row_height) + 1
+        last_row = min(int((y0 + h) // self.row_height) + 1, self.total_rows)
+        visibles = range(first_row, last_row)
+
+        # sacar las filas que ya no se ven (todos sus items en un solo delete)
+        rendered = self._rendered
+        salen = [k for k in rendered if k not in visibles]
+        if salen:
+            canvas.delete(*itertools.chain.from_iterable(rendered.pop(k) for k in salen))
+        if len(rendered) == len(visibles):
+            return
 
-        # traemos de SQLite sólo ese rango
-        visible_rows = self._fetch_rows_range(first_row, last_row)
+        # Lo que queda dibujado es un bloque seguido dentro de la vista:
+        # solo faltan los tramos de arriba y de abajo de ese bloque
+        if rendered:
+            tramos = ((first_row, min(rendered)), (max(rendered) + 1, last_row))
+        else:
+            tramos = ((first_row, last_row),)
 
-        # dibujar cada fila
-        for i, row_map in enumerate(visible_rows):
-            row_idx = first_row + i
-            y_top = row_idx * self.row_height
-            y_bot = y_top + self.row_height
+        xs = self.col_positions
+        total_w = xs[-1]
+        rh = self.row_height
+        create_text = canvas.create_text
+        cell_font = self._cell_font
+
+        # dibujar cada fila que falte, leyéndolas de a una
+        filas = itertools.chain.from_iterable(
+            zip(range(desde, hasta), self._fetch_rows_range(desde, hasta))
+            for desde, hasta in tramos
+        )
+        for row_idx, row in filas:
+            ids = rendered[row_idx] = []
+            y_top = row_idx * rh
+            y_bot = y_top + rh
 
             bg = "#ffffff" if (row_idx % 2 == 0) else "#f9fafb"
 
-            for col_idx, col in enumerate(self.columns):
-                x0, x1 = self.col_positions[col_idx]
-                # celda
-                self.body_canvas.create_rectangle(
-                    x0, y_top, x1, y_bot,
-                    fill=bg,
-                    outline="#d1d5db",
-                    width=1,
-                    tags="rowcell"
-                )
-                text_val = row_map.get(col["id"], "")
-                self.body_canvas.create_text(
-                    x0 + 4,
-                    y_top + self.row_height / 2,
-                    text=text_val,
-                    anchor="w",
-                    font=("Segoe UI", 9),
-                    tags="rowcell"
-                )
+            # fondo de toda la fila, debajo de las líneas de columna
+            fondo = canvas.create_rectangle(
+                0, y_top, total_w, y_bot,
+                fill=bg,
+                outline="",
+                tags="rowcell"
+            )
+            canvas.tag_lower(fondo)
+            ids.append(fondo)
+            # borde inferior de la fila
+            ids.append(canvas.create_line(
+                0, y_bot, total_w, y_bot,
+                fill=CELL_BORDER,
+                tags="rowcell"
+            ))
+
+            # textos: las celdas vacías (la mayoría, columnas de clientes que
+            # no están) no llevan item; la fila puede traer menos valores
+            # que columnas (ver _save_row_to_db)
+            y_mid = y_top + rh / 2
+            for x0, text_val in zip(xs, row):
+                if text_val:
+                    ids.append(create_text(
+                        x0 + 4,
+                        y_mid,
+                        text=text_val,
+                        anchor="w",
+                        font=cell_font,
+                        tags="rowcell"
+                    ))
 
     def _insert_initialization_row(self):
         """
@@ -1267,19 +1630,32 @@ class SimulationWindow(tk.Toplevel):
             "est_cli_perm_acum": fmt(0),
         }
 
-        # armamos row_map para TODAS las columnas actuales (no hay clientes aún)
-        row_map = {}
-        for col in self.columns:
-            cid = col["id"]
-            if cid == "iteracion":
-                row_map[cid] = "0"
-            elif cid.startswith("c"):
-                row_map[cid] = ""
-            else:
-                row_map[cid] = str(base.get(cid, ""))
+        # armamos la fila para TODAS las columnas actuales (no hay clientes aún)
+        row = self._build_row_map(base, {}, 0)
 
-        self._save_row_to_db(row_map)
-        self._redraw_visible_rows()
+        self._save_row_to_db(row)
+        self._refrescar_vista()
+
+    def _refrescar_vista(self):
+        """
+        Lleva a pantalla las filas y columnas agregadas desde el último
+        refresco: layout completo si aparecieron clientes nuevos, si no
+        solo scrollregion + filas visibles.
+        """
+        desde = self._filas_refrescadas
+        self._filas_refrescadas = self.total_rows
+        if self._layout_pendiente:
+            self._layout_pendiente = False
+            self._recompute_columns_layout()
+            return
+
+        self._update_scrollregion()
+        # si las filas nuevas quedan todas debajo de la vista (lo normal en
+        # modo auto con el scroll arriba), no hay nada que repintar
+        canvas = self.body_canvas
+        ultima_visible = int((canvas.canvasy(0) + canvas.winfo_height()) // self.row_height)
+        if desde <= ultima_visible:
+            self._redraw_visible_rows()
 
     def _ensure_client_columns(self, cid: int):
         """
@@ -1290,87 +1666,119 @@ class SimulationWindow(tk.Toplevel):
           c{cid}_a_que_fue,
           c{cid}_cuando_termina
         y creamos un grupo "Cliente {cid}" en el header.
-        Luego recalculamos layout y redibujamos.
+        El layout se recalcula en el próximo _refrescar_vista(), una sola
+        vez aunque en la tanda hayan aparecido varios clientes.
         """
-        if cid in self.known_clients:
+        if cid in self._inicio_cliente:
             return
 
-        self.known_clients.append(cid)
-        start_idx = len(self.columns)
+        start_idx = len(self._col_ids)
+        self._inicio_cliente[cid] = start_idx
 
-        new_cols = [
-            {"id": f"c{cid}_estado", "text": "ESTADO", "w": 110},
-            {"id": f"c{cid}_hora_llegada", "text": "HORA_LLEGADA", "w": 130},
-            {"id": f"c{cid}_a_que_fue", "text": "A QUE FUE", "w": 120},
-            {"id": f"c{cid}_cuando_termina", "text": "Cuando termina de leer", "w": 180},
-        ]
-        self.columns.extend(new_cols)
-        end_idx = len(self.columns) - 1
+        self._col_ids.extend(f"c{cid}_{campo}" for campo in self.CLIENTE_CAMPOS)
+        self._col_texts.extend(self.CLIENTE_TEXTOS)
+        self._col_widths.extend(self.CLIENTE_ANCHOS)
+        end_idx = len(self._col_ids) - 1
 
         # agregamos bloque de grupo visual
         self.groups.append((f"Cliente {cid}", start_idx, end_idx))
 
-        # recalcular posiciones de columnas, scrollregions y headers
-        self._recompute_columns_layout()
+        self._layout_pendiente = True
 
-    def _process_event(self, row_base: dict, cli_snap: dict):
+    def _ensure_client_columns_bulk(self, cids):
+        """
+        _ensure_client_columns para todos los clientes de un evento: filtra
+        primero los que ya tienen columnas (casi siempre todos) y solo
+        ordena y agrega los nuevos. El layout queda pendiente una sola vez.
+        """
+        inicio = self._inicio_cliente
+        nuevos = [cid for cid in cids if cid not in inicio]
+        if nuevos:
+            for cid in sorted(nuevos):
+                self._ensure_client_columns(cid)
+
+    def _process_event(self, row_base: dict, cli_snap: dict, redibujar=True):
         """
         Paso común para on_next() y run_all_events():
         - asegura columnas de los clientes activos
-        - arma el row_map en función del estado actual de columnas
+        - arma la fila en función del estado actual de columnas
         - guarda en DB
         - redibuja vista
         - refresca stats
+        Con redibujar=False los dos últimos pasos quedan a cargo de quien
+        llama (run_all_events los hace una vez por tanda).
         """
         # columnas dinámicas por cada cliente que aparece en esta iteración
-        for cid in sorted(cli_snap.keys()):
-            self._ensure_client_columns(cid)
+        self._ensure_client_columns_bulk(cli_snap)
 
-        # armar fila en formato {col_id: valor}
-        row_map = self._build_row_map(
+        # armar fila alineada con las columnas actuales
+        row = self._build_row_map(
             base_row=row_base,
             cli_snap=cli_snap,
             iteration_value=self.engine.iteration
         )
 
-        # persistir en disco y actualizar scroll
-        self._save_row_to_db(row_map)
+        # persistir en disco
+        self._save_row_to_db(row)
+        if not redibujar:
+            return
 
-        # redibujar filas visibles
-        self._redraw_visible_rows()
+        # actualizar scroll/columnas y redibujar filas visibles
+        self._refrescar_vista()
 
         # refrescar ventana de estadísticas si está abierta
         self._refresh_stats_window(final=False)
 
     # ---------- Simulación ----------
+    # Eventos que se procesan por tanda antes de devolverle el control a Tk
+    EVENTOS_POR_TANDA = 200
+    # Mínimo de segundos entre refrescos de la ventana de estadísticas (modo auto)
+    STATS_CADA_S = 0.25
+
     def run_all_events(self):
         """
         Ejecuta automáticamente todos los eventos restantes hasta que la simulación termine.
+        Corre de a tandas (ver _pump), así la ventana sigue respondiendo y
+        la tabla se redibuja una vez por tanda y no por evento.
+        """
+        self._proximas_stats = 0.0
+        self.after(0, self._pump)
+
+    def _pump(self):
+        """
+        Procesa hasta EVENTOS_POR_TANDA eventos, redibuja una vez y se
+        vuelve a agendar hasta que la simulación termina.
         """
-        while True:
-            try:
-                if not self.engine.hay_mas():
+        if not self.winfo_exists():
+            return
+        eng = self.engine
+        try:
+            for _ in range(self.EVENTOS_POR_TANDA):
+                if not eng.hay_mas():
                     # se acabó: integrar stats finales, mostrar alerta, abrir stats
-                    self.engine.finalizar_estadisticas()
-                    self.open_stats()
-                    self._refresh_stats_window(final=True)
-                    messagebox.showinfo(
-                        "Fin de simulación",
-                        "Se completó toda la simulación."
-                    )
-                    break
-
-                row_base, cli_snap = self.engine.siguiente_evento()
-                self._process_event(row_base, cli_snap)
-
-            except StopIteration as e:
-                self.open_stats()
-                self._refresh_stats_window(final=True)
-                messagebox.showinfo(
-                    "Fin de simulación",
-                    str(e)
-                )
-                break
+                    eng.finalizar_estadisticas()
+                    self._fin_corrida("Se completó toda la simulación.")
+                    return
+                row_base, cli_snap = eng.siguiente_evento()
+                self._process_event(row_base, cli_snap, redibujar=False)
+        except StopIteration as e:
+            self._fin_corrida(str(e))
+            return
+
+        self._refrescar_vista()
+        ahora = time.monotonic()
+        if ahora >= self._proximas_stats:
+            self._proximas_stats = ahora + self.STATS_CADA_S
+            self._refresh_stats_window(final=False)
+        # after(1) y no after(0): con un timer siempre listo Tk nunca llega
+        # a los callbacks de after_idle (repintado de la tabla y de la ventana)
+        self.after(1, self._pump)
+
+    def _fin_corrida(self, mensaje):
+        self._refrescar_vista()
+        self.open_stats()
+        self._refresh_stats_window(final=True)
+        messagebox.showinfo("Fin de simulación", mensaje)
 
     def on_next(self):
         """
@@ -1434,8 +1842,13 @@ class SimulationWindow(tk.Toplevel):
     def _on_body_configure(self, event=None):
         """
         Cuando cambia el tamaño del canvas (ej. resize de ventana),
-        redibujamos la parte visible.
+        redibujamos la parte visible. Si solo cambió el ancho no entran
+        filas nuevas: no hay nada que redibujar.
         """
+        if event is not None:
+            if event.height == self._alto_vista:
+                return
+            self._alto_vista = event.height
         self._redraw_visible_rows()
 
     def _on_mousewheel(self, event):
@@ -1506,6 +1919,13 @@ class App(tk.Tk):
 
         root.columnconfigure(0, weight=1)
 
+        # pasos de rueda acumulados hasta el próximo idle (ver _acumular_scroll)
+        self._pending_scroll = 0
+        self._scroll_scheduled = False
+        # scrollregion / ancho del frame pendientes de aplicar (ver on_frame_configure)
+        self._need_scrollregion = False
+        self._pending_width = None
+
         root.bind("<Configure>", self.on_frame_configure)
         self.canvas.bind("<Configure>", self.on_canvas_configure)
         self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
@@ -1613,6 +2033,9 @@ class App(tk.Tk):
         ttk.Button(btns, text="Restablecer", command=self.reset_defaults).grid(row=0, column=0, padx=6)
         ttk.Button(btns, text="Generar", command=self.on_generate).grid(row=0, column=1)
 
+        # Campos marcados hoy con Invalid.TEntry (solo se reconfigura la diferencia)
+        self._invalid_set = frozenset()
+
         # defaults iniciales
         self.reset_defaults()
         self._update_pct_sum()
@@ -1675,22 +2098,51 @@ class App(tk.Tk):
         queda = max(0, min(100, 100 - p))
         self.lbl_queda.configure(text=str(queda))
 
-    # Scroll del formulario (pantalla de parámetros)
+    # Scroll del formulario (pantalla de parámetros).
+    # Los <Configure> llegan en ráfagas al acomodarse el layout: se marca
+    # lo pendiente y se aplica una sola vez en el próximo idle.
     def on_frame_configure(self, event=None):
+        if not self._need_scrollregion:
+            self._need_scrollregion = True
+            self.after_idle(self._recompute_scrollregion)
+
+    def _recompute_scrollregion(self):
+        self._need_scrollregion = False
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
     def on_canvas_configure(self, event=None):
-        canvas_width = event.width
+        pendiente = self._pending_width is not None
+        self._pending_width = event.width
+        if not pendiente:
+            self.after_idle(self._apply_canvas_width)
+
+    def _apply_canvas_width(self):
+        canvas_width = self._pending_width
+        self._pending_width = None
         self.canvas.itemconfig(self.canvas_window, width=canvas_width)
 
+    # La rueda junta los pasos y desplaza una sola vez por ciclo idle
     def on_mousewheel(self, event):
-        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self._acumular_scroll(int(-1 * (event.delta / 120)))
 
     def on_mousewheel_linux(self, event):
         if event.num == 4:
-            self.canvas.yview_scroll(-1, "units")
+            self._acumular_scroll(-1)
         elif event.num == 5:
-            self.canvas.yview_scroll(1, "units")
+            self._acumular_scroll(1)
+
+    def _acumular_scroll(self, pasos):
+        self._pending_scroll += pasos
+        if not self._scroll_scheduled:
+            self._scroll_scheduled = True
+            self.after_idle(self._flush_scroll)
+
+    def _flush_scroll(self):
+        pasos = self._pending_scroll
+        self._pending_scroll = 0
+        self._scroll_scheduled = False
+        if pasos:
+            self.canvas.yview_scroll(pasos, "units")
 
     def reset_defaults(self):
         defaults = {
@@ -1708,104 +2160,67 @@ class App(tk.Tk):
             "t_lectura_biblio": 30,
         }
 
-        for k, meta in self.fields.items():
-            meta["entry"].configure(style="TEntry")
+        self._marcar_invalidos(frozenset())
         for k, v in defaults.items():
             self.fields[k]["var"].set(str(v))
 
         self.txt_out.delete("1.0", "end")
 
+    def _marcar_invalidos(self, nuevos):
+        """Deja en Invalid.TEntry exactamente los campos de `nuevos`."""
+        fields = self.fields
+        viejos = self._invalid_set
+        for k in viejos - nuevos:
+            fields[k]["entry"].configure(style="TEntry")
+        for k in nuevos - viejos:
+            fields[k]["entry"].configure(style="Invalid.TEntry")
+        self._invalid_set = nuevos
+
     def on_generate(self):
-        # limpiar estilos rojos
-        for meta in self.fields.values():
-            meta["entry"].configure(style="TEntry")
-
-        errors = []
-        mark = []
-
-        def need_int(key, desc, lo, hi):
-            val = int_or_none(self.fields[key]["var"].get())
-            if not between(val, lo, hi):
-                errors.append(f"• {desc}: debe ser entero en [{lo}, {hi}]")
-                mark.append(key)
-            return val
-
-        t_lim = need_int("tiempo_limite", "Tiempo límite X", 1, 10_000)
-        n_max = need_int("iteraciones_max", "Cantidad de iteraciones N", 1, 100_000)
-        i_mos = need_int("i_mostrar", "i (iteraciones a mostrar)", 1, 100_000)
-        j_ini = need_int("j_inicio", "j (minuto de inicio)", 0, 10_000)
-
-        if None not in (t_lim, j_ini) and j_ini >= t_lim:
-            errors.append("• j debe ser menor que X.")
-            mark += ["j_inicio", "tiempo_limite"]
-
-        if None not in (i_mos, n_max) and i_mos > n_max:
-            errors.append("• i no debería exceder N.")
-            mark += ["i_mostrar", "iteraciones_max"]
-
-        t_lleg = need_int("t_entre_llegadas", "Tiempo entre llegadas (min)", 1, 10_000)
-
-        p_ped = need_int("pct_pedir", "Pedir libros (%)", 0, 100)
-        p_dev = need_int("pct_devolver", "Devolver libros (%)", 0, 100)
-        p_con = need_int("pct_consultar", "Consultar hacerse socio (%)", 0, 100)
-
-        if None not in (p_ped, p_dev, p_con):
-            if p_ped + p_dev + p_con != 100:
-                errors.append(f"• La suma de motivos debe ser 100% (ahora {p_ped+p_dev+p_con}%).")
-                mark += ["pct_pedir", "pct_devolver", "pct_consultar"]
-
-        a = need_int("uni_a", "Uniforme A (min)", 0, 10_000)
-        b = need_int("uni_b", "Uniforme B (min)", 0, 10_000)
-
-        if None not in (a, b):
-            if a == b:
-                errors.append("• En Uniforme(A,B) debe cumplirse A ≠ B.")
-                mark += ["uni_a", "uni_b"]
-            if a > b:
-                errors.append("• En Uniforme(A,B) debe cumplirse A < B.")
-                mark += ["uni_a", "uni_b"]
-
-        p_ret = need_int("pct_retira", "Se retira a leer en casa (%)", 0, 100)
-        t_bib = need_int("t_lectura_biblio", "Tiempo fijo en biblioteca (min)", 1, 10_000)
+        fields = self.fields
+        errors, mark, vals = validar_campos(
+            tuple(fields[key]["var"].get() for key, *_ in FIELD_SPECS)
+        )
+
+        # Estilos rojos: solo se tocan los campos que cambian de estado
+        self._marcar_invalidos(mark)
 
         if errors:
-            for k in set(mark):
-                self.fields[k]["entry"].configure(style="Invalid.TEntry")
-            messagebox.showerror("Validación", "Revisá:\n\n" + "\n".join(errors))
+            messagebox.showerror("Validación", _format_errors(errors))
             return
 
         cfg = {
             "simulacion": {
-                "tiempo_limite_min": t_lim,
-                "iteraciones_max": n_max,
+                "tiempo_limite_min": vals["tiempo_limite"],
+                "iteraciones_max": vals["iteraciones_max"],
                 "mostrar_vector_estado": {
-                    "i_iteraciones": i_mos,
-                    "desde_minuto_j": j_ini
+                    "i_iteraciones": vals["i_mostrar"],
+                    "desde_minuto_j": vals["j_inicio"]
                 },
                 "modo_auto": bool(self.auto_var.get())
             },
             "llegadas": {
-                "tiempo_entre_llegadas_min": t_lleg
+                "tiempo_entre_llegadas_min": vals["t_entre_llegadas"]
             },
             "motivos": {
-                "pedir_libros_pct": p_ped,
-                "devolver_libros_pct": p_dev,
-                "consultar_socios_pct": p_con
+                "pedir_libros_pct": vals["pct_pedir"],
+                "devolver_libros_pct": vals["pct_devolver"],
+                "consultar_socios_pct": vals["pct_consultar"]
             },
             "consultas_uniforme": {
-                "a_min": a,
-                "b_min": b
+                "a_min": vals["uni_a"],
+                "b_min": vals["uni_b"]
             },
             "lectura": {
-                "retira_casa_pct": p_ret,
-                "queda_biblioteca_pct": 100 - p_ret,
-                "tiempo_fijo_biblioteca_min": t_bib
+                "retira_casa_pct": vals["pct_retira"],
+                "queda_biblioteca_pct": 100 - vals["pct_retira"],
+                "tiempo_fijo_biblioteca_min": vals["t_lectura_biblio"]
             }
         }
 
         # Mostrar config en el textbox y llevar al portapapeles
+        pretty = config_a_json(cfg)
         self.txt_out.delete("1.0", "end")
-        pretty = json.dumps(cfg, indent=2, ensure_ascii=False)
         self.txt_out.insert("1.0", pretty)
         self.clipboard_clear()
         self.clipboard_append(pretty)